@@ -1,23 +1,55 @@
 import time
 import heapq
-from maze_generator.common import get_neighbors
+import numpy as np
+from maze_generator.common import reconstruct_path
+from maze_generator.graph import as_graph
 
-def solve_astar(maze, start, goal):
+def solve_astar(maze, start, goal, stats=None):
     start_time = time.time()
-    def heuristic(a, b):
-        return abs(a[0]-b[0]) + abs(a[1]-b[1])
-    open_set = []
-    heapq.heappush(open_set, (heuristic(start, goal), 0, start, [start]))
-    visited = {}
+    graph = as_graph(maze)
+    start_id, goal_id = graph.node(start), graph.node(goal)
+    if start_id < 0 or goal_id < 0:
+        return None, 0, time.time() - start_time
+    indptr, indices = graph.csr_lists()
+    num_nodes = graph.num_nodes
+    # Manhattan distance to the goal for every cell in one vectorized pass.
+    heuristic = (np.abs(graph.coords[:, 0] - goal[0]) + np.abs(graph.coords[:, 1] - goal[1])).tolist()
+    g_score = np.full(num_nodes, np.iinfo(np.int32).max, dtype=np.int32)
+    closed = np.zeros(num_nodes, dtype=bool)
+    parent = np.full(num_nodes, -1, dtype=np.int32)
+
+    # Heap entries are single ints packing (f, deepest g first, node id), so heapq only
+    # ever compares ints. Stale entries are skipped when popped.
+    bits = num_nodes.bit_length()
+    node_mask = (1 << bits) - 1
+    g_score[start_id] = 0
+    parent[start_id] = start_id
+    open_set = [((heuristic[start_id] << bits | node_mask) << bits) | start_id]
+    expanded, pushes, pops, frontier_max = 0, 1, 0, 1
     while open_set:
-        f, g, current, path = heapq.heappop(open_set)
-        if current == goal:
+        current = heapq.heappop(open_set) & node_mask
+        pops += 1
+        if closed[current]:
+            continue
+        closed[current] = True
+        expanded += 1
+        if current == goal_id:
+            if stats is not None:
+                stats.update(expanded=expanded, heap_pushes=pushes, heap_pops=pops, frontier_max=frontier_max)
+            path = reconstruct_path(parent, current, graph.coords)
             runtime = time.time() - start_time
             return path, len(path), runtime
-        if current in visited and visited[current] <= g:
-            continue
-        visited[current] = g
-        for neighbor in get_neighbors(current, maze):
-            new_cost = g + 1
-            heapq.heappush(open_set, (new_cost + heuristic(neighbor, goal), new_cost, neighbor, path + [neighbor]))
-    return None, 0, time.time() - start_time
+        new_cost = int(g_score[current]) + 1
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            if new_cost < g_score[neighbor]:
+                g_score[neighbor] = new_cost
+                parent[neighbor] = current
+                f = new_cost + heuristic[neighbor]
+                heapq.heappush(open_set, ((f << bits | (node_mask - new_cost)) << bits) | neighbor)
+                pushes += 1
+        if len(open_set) > frontier_max:
+            frontier_max = len(open_set)
+    if stats is not None:
+        stats.update(expanded=expanded, heap_pushes=pushes, heap_pops=pops, frontier_max=frontier_max)
+    return None, 0, time.time() - start_time
\ No newline at end of file
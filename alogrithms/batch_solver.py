@@ -0,0 +1,64 @@
+import time
+import numpy as np
+from maze_generator.common import follow_successors
+from maze_generator.graph import as_graph
+
+def distance_field(graph, goal_id):
+    # Reverse BFS from the goal, one vectorized step per distance level. Moves are
+    # symmetric, so distances to the goal equal distances from it. -1 marks cells
+    # that cannot reach the goal.
+    dist = np.full(graph.num_nodes, -1, dtype=np.int32)
+    dist[goal_id] = 0
+    frontier = np.array([goal_id])
+    level = 0
+    while frontier.size:
+        level += 1
+        frontier = np.unique(graph.adjacency[frontier])
+        frontier = frontier[frontier >= 0]
+        frontier = frontier[dist[frontier] < 0]
+        dist[frontier] = level
+    return dist
+
+def goal_next_hops(graph, dist):
+    # For every cell, its first neighbour (in action order) one step closer to the goal.
+    # The goal points at itself, unreachable cells at -1.
+    hops = np.full(graph.num_nodes, -1, dtype=np.int32)
+    goal_ids = np.flatnonzero(dist == 0)
+    hops[goal_ids] = goal_ids
+    for a in reversed(range(graph.adjacency.shape[1])):
+        neighbor = graph.adjacency[:, a]
+        closer = (neighbor >= 0) & (dist > 0)
+        closer[closer] = dist[neighbor[closer]] == dist[closer] - 1
+        hops[closer] = neighbor[closer]
+    return hops
+
+def solve_batch(maze, starts, goal, next_hops=None, stats=None):
+    # Answers many start queries against one goal from a single precomputed field.
+    # next_hops may be any successor array over the graph's nodes, e.g. a converged MDP
+    # policy from greedy_successors; by default it comes from a reverse BFS from the goal.
+    # Paths are yielded one by one as (path, steps, runtime), so memory stays bounded
+    # by the longest path rather than the number of queries.
+    setup_start = time.perf_counter()
+    graph = as_graph(maze)
+    goal_id = graph.node(goal)
+    if goal_id < 0:
+        raise ValueError("Goal state is not passable!")
+    if next_hops is None:
+        next_hops = goal_next_hops(graph, distance_field(graph, goal_id))
+    if stats is not None:
+        stats["setup_time"] = time.perf_counter() - setup_start
+    return _walk_queries(graph, next_hops, starts, goal_id)
+
+def _walk_queries(graph, next_hops, starts, goal_id):
+    # A plain list makes the per-step pointer chase several times faster than NumPy scalars.
+    next_hops = np.asarray(next_hops).tolist()
+    for start in starts:
+        query_start = time.perf_counter()
+        start_id = graph.node(start)
+        if start_id < 0 or next_hops[start_id] < 0:
+            yield None, 0, time.perf_counter() - query_start
+            continue
+        path = follow_successors(next_hops, start_id, goal_id, graph.coords)
+        if path[-1] != graph.cell(goal_id):
+            path = None
+        yield path, len(path) if path else 0, time.perf_counter() - query_start
@@ -1,23 +1,118 @@
 import time
 from collections import deque
-from maze_generator.common import get_neighbors
+import numpy as np
+from maze_generator.common import reconstruct_path
+from maze_generator.graph import MazeGraph, as_graph
 
-def solve_bfs(maze, start, goal):
+# Levels narrower than this are expanded in a plain loop: below it, the fixed cost of the
+# NumPy calls outweighs the per-cell interpreter cost they save (long corridors).
+vectorize_min_frontier = 32
+
+def solve_bfs(maze, start, goal, stats=None, method="frontier"):
+    # method="frontier" expands one distance level at a time with array operations on the
+    # grid; method="queue" is the classic one-node-at-a-time deque BFS over the MazeGraph.
+    # Both settle ties the same way, so they return the same path.
     start_time = time.time()
-    queue = deque([(start, [start])])
-    visited = set()
+    if method == "frontier":
+        path, expanded, frontier_max = _frontier_bfs(maze, start, goal)
+        if stats is not None:
+            stats.update(expanded=expanded, frontier_max=frontier_max)
+        runtime = time.time() - start_time
+        return path, len(path) if path else 0, runtime
+    if method != "queue":
+        raise ValueError(f"Unknown BFS method: {method}")
+    graph = as_graph(maze)
+    start_id, goal_id = graph.node(start), graph.node(goal)
+    if start_id < 0 or goal_id < 0:
+        return None, 0, time.time() - start_time
+    indptr, indices = graph.csr_lists()
+    parent = np.full(graph.num_nodes, -1, dtype=np.int32)
+    parent[start_id] = start_id
+    queue = deque([start_id])
+    expanded, frontier_max = 0, 1
     while queue:
-        current, path = queue.popleft()
-        if current == goal:
+        current = queue.popleft()
+        expanded += 1
+        if current == goal_id:
+            if stats is not None:
+                stats.update(expanded=expanded, frontier_max=frontier_max)
+            path = reconstruct_path(parent, current, graph.coords)
             runtime = time.time() - start_time
             return path, len(path), runtime
-        if current in visited:
-            continue
-        visited.add(current)
-        for neighbor in get_neighbors(current, maze):
-            if neighbor not in visited:
-                queue.append((neighbor, path + [neighbor]))
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            if parent[neighbor] == -1:
+                parent[neighbor] = current
+                queue.append(neighbor)
+        if len(queue) > frontier_max:
+            frontier_max = len(queue)
+    if stats is not None:
+        stats.update(expanded=expanded, frontier_max=frontier_max)
     return None, 0, time.time() - start_time
 
+def _frontier_bfs(maze, start, goal):
+    # Level-synchronous BFS on the grid padded with one wall cell on every side, cells as
+    # flat indices. `blocked` marks walls and visited cells alike, so one lookup filters a
+    # neighbour, and `came` keeps the action that reached each cell. No MazeGraph is needed.
+    # The frontier stays in the order the queue BFS would dequeue the level in, and its
+    # neighbours are gathered in (frontier, action) order; a cell reached from several
+    # frontier cells keeps the first, as in the queue BFS. Returns (path, expanded, frontier_max).
+    grid = np.asarray(maze.maze if isinstance(maze, MazeGraph) else maze)
+    rows, cols = grid.shape
+    if not all(0 <= r < rows and 0 <= c < cols and grid[r, c] == 0 for r, c in (start, goal)):
+        return None, 0, 0
+    width = cols + 2
+    index_dtype = np.int32 if (rows + 2) * width < 2 ** 31 else np.int64
+    # bytearrays viewed by NumPy: the narrow levels index the bytearrays, the wide ones the arrays.
+    blocked_bytes = bytearray(np.pad(grid != 0, 1, constant_values=True).astype(np.uint8).tobytes())
+    came_bytes = bytearray(len(blocked_bytes))
+    blocked = np.frombuffer(blocked_bytes, dtype=np.uint8)
+    came = np.frombuffer(came_bytes, dtype=np.uint8)
+    steps = (-width, width, -1, 1)
+    offsets = np.array(steps, dtype=index_dtype)
+
+    start_pos = (start[0] + 1) * width + start[1] + 1
+    goal_pos = (goal[0] + 1) * width + goal[1] + 1
+    blocked_bytes[start_pos] = 1
+    frontier = [start_pos]
+    expanded, frontier_max = 0, 1
+    while len(frontier) and not blocked_bytes[goal_pos]:
+        expanded += len(frontier)
+        if len(frontier) < vectorize_min_frontier:
+            next_frontier = []
+            for pos in (frontier.tolist() if isinstance(frontier, np.ndarray) else frontier):
+                for action, step in enumerate(steps):
+                    neighbor = pos + step
+                    if not blocked_bytes[neighbor]:
+                        blocked_bytes[neighbor] = 1
+                        came_bytes[neighbor] = action
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        else:
+            neighbors = (np.asarray(frontier, dtype=index_dtype)[:, None] + offsets).ravel()
+            order = np.flatnonzero(blocked.take(neighbors) == 0)
+            neighbors = neighbors.take(order)
+            action = (order & 3).astype(np.uint8)
+            # Repeated fancy-index writes are applied in order, so writing the candidates back
+            # to front leaves each cell with the action of its first occurrence. Candidates for
+            # the same cell come from different directions, so the action identifies the winner.
+            came[neighbors[::-1]] = action[::-1]
+            first = came.take(neighbors) == action
+            if not first.all():
+                neighbors = neighbors.compress(first)
+            blocked[neighbors] = 1
+            frontier = neighbors
+        if len(frontier) > frontier_max:
+            frontier_max = len(frontier)
+    if not blocked_bytes[goal_pos]:
+        return None, expanded, frontier_max
+
+    positions = [goal_pos]
+    while positions[-1] != start_pos:
+        positions.append(positions[-1] - steps[came_bytes[positions[-1]]])
+    positions.reverse()
+    r, c = np.divmod(np.array(positions), width)
+    return list(zip((r - 1).tolist(), (c - 1).tolist())), expanded, frontier_max
+
 if __name__ == "__main__":
     pass
\ No newline at end of file
@@ -0,0 +1,68 @@
+import time
+import heapq
+import numpy as np
+from maze_generator.common import join_bidirectional_path
+from maze_generator.graph import as_graph
+
+def solve_bidirectional_astar(maze, start, goal, stats=None):
+    start_time = time.time()
+    graph = as_graph(maze)
+    start_id, goal_id = graph.node(start), graph.node(goal)
+    if start_id < 0 or goal_id < 0:
+        return None, 0, time.time() - start_time
+    indptr, indices = graph.csr_lists()
+    num_nodes = graph.num_nodes
+    rows, cols = graph.coords[:, 0], graph.coords[:, 1]
+    # Side 0 searches from the start towards the goal, side 1 from the goal towards the start.
+    heuristics = ((np.abs(rows - goal[0]) + np.abs(cols - goal[1])).tolist(),
+                  (np.abs(rows - start[0]) + np.abs(cols - start[1])).tolist())
+    unreached = np.iinfo(np.int32).max
+    g_scores = (np.full(num_nodes, unreached, dtype=np.int32), np.full(num_nodes, unreached, dtype=np.int32))
+    closed = (np.zeros(num_nodes, dtype=bool), np.zeros(num_nodes, dtype=bool))
+    parents = (np.full(num_nodes, -1, dtype=np.int32), np.full(num_nodes, -1, dtype=np.int32))
+
+    # Same packed (f, deepest g first, node id) heap keys as solve_astar.
+    bits = num_nodes.bit_length()
+    node_mask = (1 << bits) - 1
+    open_sets = ([], [])
+    for side, root in enumerate((start_id, goal_id)):
+        g_scores[side][root] = 0
+        parents[side][root] = root
+        open_sets[side].append(((heuristics[side][root] << bits | node_mask) << bits) | root)
+
+    best = 0 if start_id == goal_id else unreached
+    meet = (start_id, goal_id)
+    expanded, frontier_max = 0, 2
+    while open_sets[0] and open_sets[1]:
+        # The smallest f on either open list is a lower bound on any path not found yet.
+        if best <= max(open_sets[0][0], open_sets[1][0]) >> (2 * bits):
+            break
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        open_set, g_score, parent, heuristic = open_sets[side], g_scores[side], parents[side], heuristics[side]
+        other_g = g_scores[1 - side]
+        current = heapq.heappop(open_set) & node_mask
+        if closed[side][current]:
+            continue
+        closed[side][current] = True
+        expanded += 1
+        new_cost = int(g_score[current]) + 1
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            if new_cost < g_score[neighbor]:
+                g_score[neighbor] = new_cost
+                parent[neighbor] = current
+                f = new_cost + heuristic[neighbor]
+                heapq.heappush(open_set, ((f << bits | (node_mask - new_cost)) << bits) | neighbor)
+            if other_g[neighbor] != unreached and new_cost + int(other_g[neighbor]) < best:
+                best = new_cost + int(other_g[neighbor])
+                meet = (current, neighbor) if side == 0 else (neighbor, current)
+        if len(open_sets[0]) + len(open_sets[1]) > frontier_max:
+            frontier_max = len(open_sets[0]) + len(open_sets[1])
+
+    if stats is not None:
+        stats.update(expanded=expanded, frontier_max=frontier_max)
+    if best == unreached:
+        return None, 0, time.time() - start_time
+    path = join_bidirectional_path(parents[0], parents[1], meet[0], meet[1], graph.coords)
+    runtime = time.time() - start_time
+    return path, len(path), runtime
@@ -0,0 +1,48 @@
+import time
+import numpy as np
+from maze_generator.common import join_bidirectional_path
+from maze_generator.graph import as_graph
+
+def solve_bidirectional_bfs(maze, start, goal, stats=None):
+    start_time = time.time()
+    graph = as_graph(maze)
+    start_id, goal_id = graph.node(start), graph.node(goal)
+    if start_id < 0 or goal_id < 0:
+        return None, 0, time.time() - start_time
+    indptr, indices = graph.csr_lists()
+    parents = (np.full(graph.num_nodes, -1, dtype=np.int32), np.full(graph.num_nodes, -1, dtype=np.int32))
+    parents[0][start_id] = start_id
+    parents[1][goal_id] = goal_id
+    frontiers = ([start_id], [goal_id])
+    meet = start_id if start_id == goal_id else -1
+    expanded, frontier_max = 0, 2
+
+    # Expand one full level of the smaller frontier at a time. Before a level no cell is
+    # labelled by both sides, so any cell where they first touch lies on a shortest path
+    # (it must sit on the other side's current frontier) and the search stops right there.
+    while meet < 0 and frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        parent, other = parents[side], parents[1 - side]
+        next_frontier = []
+        for current in frontiers[side]:
+            expanded += 1
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                if parent[neighbor] == -1:
+                    parent[neighbor] = current
+                    next_frontier.append(neighbor)
+                    if other[neighbor] != -1:
+                        meet = neighbor
+                        break
+            if meet >= 0:
+                break
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+        frontier_max = max(frontier_max, len(frontiers[0]) + len(frontiers[1]))
+
+    if stats is not None:
+        stats.update(expanded=expanded, frontier_max=frontier_max)
+    if meet < 0:
+        return None, 0, time.time() - start_time
+    path = join_bidirectional_path(parents[0], parents[1], meet, meet, graph.coords)
+    runtime = time.time() - start_time
+    return path, len(path), runtime
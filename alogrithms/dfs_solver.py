@@ -1,19 +1,36 @@
 import time
-from maze_generator.common import get_neighbors
+import numpy as np
+from maze_generator.common import reconstruct_path
+from maze_generator.graph import as_graph
 
-def solve_dfs(maze, start, goal):
+def solve_dfs(maze, start, goal, stats=None):
     start_time = time.time()
-    stack = [(start, [start])]
-    visited = set()
+    graph = as_graph(maze)
+    start_id, goal_id = graph.node(start), graph.node(goal)
+    if start_id < 0 or goal_id < 0:
+        return None, 0, time.time() - start_time
+    indptr, indices = graph.csr_lists()
+    parent = np.full(graph.num_nodes, -1, dtype=np.int32)
+    stack = [(start_id, start_id)]
+    expanded, frontier_max = 0, 1
     while stack:
-        current, path = stack.pop()
-        if current == goal:
+        current, parent_id = stack.pop()
+        if parent[current] != -1:
+            continue
+        parent[current] = parent_id
+        expanded += 1
+        if current == goal_id:
+            if stats is not None:
+                stats.update(expanded=expanded, frontier_max=frontier_max)
+            path = reconstruct_path(parent, current, graph.coords)
             runtime = time.time() - start_time
             return path, len(path), runtime
-        if current in visited:
-            continue
-        visited.add(current)
-        for neighbor in get_neighbors(current, maze):
-            if neighbor not in visited:
-                stack.append((neighbor, path + [neighbor]))
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            if parent[neighbor] == -1:
+                stack.append((neighbor, current))
+        if len(stack) > frontier_max:
+            frontier_max = len(stack)
+    if stats is not None:
+        stats.update(expanded=expanded, frontier_max=frontier_max)
     return None, 0, time.time() - start_time
\ No newline at end of file
@@ -0,0 +1,162 @@
+import time
+import heapq
+import numpy as np
+from maze_generator.graph import MazeGraph
+
+INF = float("inf")
+
+# D* Lite (Koenig & Likhachev) for mazes that are edited while being solved. The search
+# runs backwards from the goal and keeps g/rhs estimates for every cell it has touched.
+# After update_cells opens or closes some cells, replan only re-expands the cells whose
+# distance to the goal actually changed instead of searching from scratch; set_start
+# moves the start without invalidating the search (the km key offset).
+#
+#   planner = DStarLitePlanner(maze, start, goal)
+#   path, steps, runtime = planner.replan()
+#   planner.update_cells([((r, c), 0), ((r2, c2), 1)])   # 0 opens a cell, 1 walls it
+#   path, steps, runtime = planner.replan()
+#
+# Cells live in a copy of the grid padded with one wall cell on every side, as flat
+# indices, so neighbour steps need no bounds checks.
+class DStarLitePlanner:
+    def __init__(self, maze, start, goal):
+        grid = np.asarray(maze.maze if isinstance(maze, MazeGraph) else maze)
+        self.shape = grid.shape
+        self.width = self.shape[1] + 2
+        self.walkable = bytearray(np.pad(grid == 0, 1).astype(np.uint8).tobytes())
+        self.steps = (-self.width, self.width, -1, 1)
+        self.g = [INF] * len(self.walkable)
+        self.rhs = [INF] * len(self.walkable)
+        self.start = self.last_start = self._pos(start)
+        self.goal = self._pos(goal)
+        self.km = 0
+        self.open = []
+        self.open_keys = {}
+        self.expanded = 0
+        self._update_vertex(self.goal)
+
+    def _pos(self, cell):
+        r, c = cell
+        if not (0 <= r < self.shape[0] and 0 <= c < self.shape[1]):
+            raise ValueError(f"Cell {cell} is outside the maze!")
+        return (r + 1) * self.width + c + 1
+
+    def _cell(self, pos):
+        r, c = divmod(pos, self.width)
+        return (r - 1, c - 1)
+
+    def _heuristic(self, a, b):
+        ar, ac = divmod(a, self.width)
+        br, bc = divmod(b, self.width)
+        return abs(ar - br) + abs(ac - bc)
+
+    def _key(self, u):
+        best = min(self.g[u], self.rhs[u])
+        return (best + self._heuristic(self.start, u) + self.km, best)
+
+    def _update_vertex(self, u):
+        walkable, g = self.walkable, self.g
+        if u == self.goal:
+            self.rhs[u] = 0 if walkable[u] else INF
+        elif walkable[u]:
+            best = INF
+            for d in self.steps:
+                v = u + d
+                if walkable[v] and g[v] < best:
+                    best = g[v]
+            self.rhs[u] = best + 1
+        else:
+            self.rhs[u] = INF
+        if g[u] != self.rhs[u]:
+            key = self._key(u)
+            self.open_keys[u] = key
+            heapq.heappush(self.open, (key[0], key[1], u))
+        else:
+            self.open_keys.pop(u, None)
+
+    def _compute_shortest_path(self):
+        g, rhs, walkable, open_set, open_keys = self.g, self.rhs, self.walkable, self.open, self.open_keys
+        start = self.start
+        expanded = 0
+        while open_set:
+            k1, k2, u = open_set[0]
+            if open_keys.get(u) != (k1, k2):
+                heapq.heappop(open_set)
+                continue
+            start_best = min(g[start], rhs[start])
+            if (k1, k2) >= (start_best + self.km, start_best) and rhs[start] == g[start]:
+                break
+            heapq.heappop(open_set)
+            new_key = self._key(u)
+            if (k1, k2) < new_key:
+                open_keys[u] = new_key
+                heapq.heappush(open_set, (new_key[0], new_key[1], u))
+                continue
+            del open_keys[u]
+            expanded += 1
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+            else:
+                g[u] = INF
+                self._update_vertex(u)
+            for d in self.steps:
+                v = u + d
+                if walkable[v]:
+                    self._update_vertex(v)
+        self.expanded += expanded
+        return expanded
+
+    def update_cells(self, changes):
+        # changes: iterable of ((r, c), value) with the maze convention, 1 wall and 0 open.
+        affected = set()
+        for cell, value in changes:
+            pos = self._pos(cell)
+            walkable = 0 if value else 1
+            if self.walkable[pos] == walkable:
+                continue
+            self.walkable[pos] = walkable
+            affected.add(pos)
+            affected.update(pos + d for d in self.steps)
+        for pos in affected:
+            self._update_vertex(pos)
+        return len(affected)
+
+    def set_start(self, cell):
+        new_start = self._pos(cell)
+        self.km += self._heuristic(self.last_start, new_start)
+        self.start = self.last_start = new_start
+
+    def replan(self, stats=None):
+        start_time = time.time()
+        expanded = self._compute_shortest_path()
+        if stats is not None:
+            stats["expanded"] = expanded
+        if self.g[self.start] == INF or not self.walkable[self.start]:
+            return None, 0, time.time() - start_time
+
+        # Descend the distance field from the start: each step moves to a neighbour one closer.
+        g, walkable = self.g, self.walkable
+        pos = self.start
+        path = [self._cell(pos)]
+        for _ in range(len(g)):
+            if pos == self.goal:
+                break
+            pos = min((pos + d for d in self.steps if walkable[pos + d]), key=g.__getitem__)
+            path.append(self._cell(pos))
+        runtime = time.time() - start_time
+        return path, len(path), runtime
+
+    def to_maze(self):
+        # The maze as currently edited, as a uint8 0/1 grid.
+        padded = np.frombuffer(bytes(self.walkable), dtype=np.uint8).reshape(self.shape[0] + 2, self.width)
+        return (padded[1:-1, 1:-1] == 0).astype(np.uint8)
+
+def solve_dstar_lite(maze, start, goal, stats=None):
+    # One-shot use of the planner, with the same contract as the other solvers.
+    start_time = time.time()
+    rows, cols = maze.shape
+    if not all(0 <= r < rows and 0 <= c < cols for r, c in (start, goal)):
+        return None, 0, time.time() - start_time
+    planner = DStarLitePlanner(maze, start, goal)
+    path, steps, _ = planner.replan(stats=stats)
+    return path, steps, time.time() - start_time
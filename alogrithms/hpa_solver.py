@@ -0,0 +1,402 @@
+import os
+import time
+import heapq
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+from maze_generator.cache import DEFAULT_CACHE_DIR
+from maze_generator.graph import MazeGraph, maze_fingerprint
+
+INF = float("inf")
+
+# Hierarchical path-finding A* (HPA*, Botea, Müller & Schaeffer). The grid is cut into
+# square clusters. Every maximal run of open cell pairs across a cluster border gives one
+# entrance (two for runs of 6 or more), an abstract node on each side joined by a step of
+# cost 1, and the distances between the entrances of each cluster, found by BFS inside the
+# cluster, are the intra-cluster edges. A query links start and goal to the entrances of
+# their clusters, runs A* over this small abstract graph and refines each abstract step
+# into cells with a BFS inside one cluster (cached, as queries share them). Paths are
+# near-optimal: the abstract search only crosses borders at the chosen entrances.
+# Preprocessing also stores every entrance's distance to a few landmark cells (ALT): by
+# the triangle inequality |d(L, v) - d(L, goal)| is a lower bound on d(v, goal), much
+# tighter than the Manhattan distance once walls force detours, so A* expands fewer nodes.
+#
+#   planner = HPAStar(maze, cluster_size=16)       # or load_hpa(maze) for the on-disk cache
+#   path, steps, runtime = planner.query(start, goal)
+#   path, steps, runtime = solve_hpa(maze, start, goal)   # planner cached per process (cache_dir: and on disk)
+
+# Arrays that make up the preprocessed abstract graph (what load_hpa caches on disk).
+abstract_fields = ("node_cells", "indptr", "indices", "weights", "landmark_dist")
+
+def _runs(mask, block):
+    # Maximal runs of True along axis 1 of a 2D mask, also split at multiples of `block`.
+    # Returns (row, first, last) arrays.
+    edge = np.zeros((mask.shape[0], 1), dtype=bool)
+    padded = np.concatenate([edge, mask, edge], axis=1)
+    cut = np.zeros(padded.shape[1] - 1, dtype=bool)
+    cut[::block] = True
+    starts = padded[:, 1:] & ~(padded[:, :-1] & ~cut)
+    ends = padded[:, :-1] & ~(padded[:, 1:] & ~cut)
+    rows, first = np.nonzero(starts[:, :-1])
+    _, last = np.nonzero(ends[:, 1:])
+    return rows, first, last
+
+def _entrances(border, first, last):
+    # One transition in the middle of a short run, one at each end of a long one.
+    # Returns (border, position along it) per transition.
+    short = last - first < 5
+    return (np.concatenate([border[short], border[~short], border[~short]]),
+            np.concatenate([((first + last) // 2)[short], first[~short], last[~short]]))
+
+def _grid_bfs(blocked, sources, offsets, regions=None):
+    # Multi-source BFS on a flat padded grid, one level at a time. blocked is modified.
+    # With regions, a step is only taken between cells of the same region. Returns the
+    # distances (-1 where not reached).
+    dist = np.full(len(blocked), -1, dtype=np.int32)
+    tag = np.empty(len(blocked), dtype=np.int64)
+    frontier = np.asarray(sources)
+    blocked[frontier] = 1
+    dist[frontier] = 0
+    level = 0
+    while len(frontier):
+        level += 1
+        neighbors = (frontier[:, None] + offsets).ravel()
+        keep = blocked[neighbors] == 0
+        if regions is not None:
+            keep &= regions[neighbors] == np.repeat(regions[frontier], len(offsets))
+        neighbors = neighbors[keep]
+        # Any one of several writes to a cell wins; keeping the winners drops duplicates.
+        tag[neighbors] = np.arange(len(neighbors))
+        neighbors = neighbors[tag[neighbors] == np.arange(len(neighbors))]
+        blocked[neighbors] = 1
+        dist[neighbors] = level
+        frontier = neighbors
+    return dist
+
+class HPAStar:
+    def __init__(self, maze, cluster_size=16, arrays=None, landmarks=8):
+        grid = np.asarray(maze.maze if isinstance(maze, MazeGraph) else maze)
+        self.grid = grid
+        self.shape = grid.shape
+        self.cluster_size = cluster_size
+        self.landmarks = landmarks
+        self.width = self.shape[1] + 2
+        self.cluster_cols = -(-self.shape[1] // cluster_size)
+        if arrays is None:
+            begin = time.perf_counter()
+            arrays = self._build()
+            self.preprocess_time = time.perf_counter() - begin
+        else:
+            self.preprocess_time = 0.0
+        for field in abstract_fields:
+            setattr(self, field, arrays[field])
+        # Plain Python lists for the query loops.
+        node_rows, node_cols = np.divmod(self.node_cells, self.width)
+        self._node_cells = list(zip((node_rows - 1).tolist(), (node_cols - 1).tolist()))
+        self._cluster_nodes = {}
+        for node, cluster in enumerate(self._cluster(node_rows - 1, node_cols - 1).tolist()):
+            self._cluster_nodes.setdefault(cluster, []).append(node)
+        indptr = self.indptr.tolist()
+        edges = list(zip(self.indices.tolist(), self.weights.tolist()))
+        self._neighbors = [edges[lo:hi] for lo, hi in zip(indptr[:-1], indptr[1:])]
+        self._landmark_dist = [memoryview(row) for row in np.ascontiguousarray(self.landmark_dist)]
+        # Refined intra-cluster steps, (from node, to node) -> cells, least recently used first out.
+        self._segments = OrderedDict()
+        self.segment_cache_size = 100000
+
+    @property
+    def num_nodes(self):
+        return len(self.node_cells)
+
+    def arrays(self):
+        return {field: getattr(self, field) for field in abstract_fields}
+
+    def _cluster(self, r, c):
+        return (r // self.cluster_size) * self.cluster_cols + c // self.cluster_size
+
+    def _build(self):
+        rows, cols = self.shape
+        size, width = self.cluster_size, self.width
+        open_cells = self.grid == 0
+
+        # Transitions across the borders between cluster columns, then cluster rows, as
+        # pairs of flat positions in the grid padded with one wall cell on every side.
+        left, right = [], []
+        borders = np.arange(size - 1, cols - 1, size)
+        if len(borders):
+            mask = (open_cells[:, borders] & open_cells[:, borders + 1]).T
+            border, r = _entrances(*_runs(mask, size))
+            c = borders[border]
+            left.append((r + 1) * width + c + 1)
+            right.append((r + 1) * width + c + 2)
+        borders = np.arange(size - 1, rows - 1, size)
+        if len(borders):
+            mask = open_cells[borders] & open_cells[borders + 1]
+            border, c = _entrances(*_runs(mask, size))
+            r = borders[border]
+            left.append((r + 1) * width + c + 1)
+            right.append((r + 2) * width + c + 1)
+        left = np.concatenate(left) if left else np.zeros(0, dtype=np.int64)
+        right = np.concatenate(right) if right else np.zeros(0, dtype=np.int64)
+        node_cells = np.unique(np.concatenate([left, right]))
+        edges = [(np.searchsorted(node_cells, left), np.searchsorted(node_cells, right), np.ones(len(left)))]
+        edges.append((edges[0][1], edges[0][0], edges[0][2]))
+
+        # Intra-cluster distances. Round k runs one BFS from the k-th entrance of every
+        # cluster at once; steps that would leave the source's cluster are not taken.
+        blocked_base = np.pad(~open_cells, 1, constant_values=True).reshape(-1).view(np.uint8)
+        r_idx = np.arange(rows + 2) - 1
+        c_idx = np.arange(width) - 1
+        cluster_ids = ((r_idx[:, None] // size) * self.cluster_cols + c_idx[None, :] // size).astype(np.int32)
+        cluster_ids[[0, -1], :] = -1
+        cluster_ids[:, [0, -1]] = -1
+        cluster_ids = cluster_ids.reshape(-1)
+        node_clusters = cluster_ids[node_cells]
+        order = np.argsort(node_clusters, kind="stable")
+        group_start = np.searchsorted(node_clusters[order], node_clusters[order])
+        rank = np.empty(len(node_cells), dtype=np.int64)
+        rank[order] = np.arange(len(node_cells)) - group_start
+        source_of_cluster = np.full(int(cluster_ids.max()) + 1, -1, dtype=np.int64)
+        offsets = np.array([-width, width, -1, 1])
+        for k in range(int(rank.max()) + 1 if len(rank) else 0):
+            sources = np.flatnonzero(rank == k)
+            dist = _grid_bfs(blocked_base.copy(), node_cells[sources], offsets, cluster_ids)
+            source_of_cluster.fill(-1)
+            source_of_cluster[node_clusters[sources]] = sources
+            source = source_of_cluster[node_clusters]
+            d = dist[node_cells]
+            linked = (source >= 0) & (d > 0)
+            edges.append((source[linked], np.flatnonzero(linked), d[linked]))
+
+        # Landmarks by farthest-point selection: the first open cell, then each time the
+        # open cell farthest from all landmarks chosen so far.
+        landmark_dist = np.full((self.landmarks, len(node_cells)), -1, dtype=np.int32)
+        open_positions = np.flatnonzero(blocked_base == 0)
+        landmark, nearest = open_positions[:1], None
+        for k in range(self.landmarks if len(open_positions) else 0):
+            dist = _grid_bfs(blocked_base.copy(), landmark, offsets)
+            landmark_dist[k] = dist[node_cells]
+            nearest = dist if nearest is None else np.minimum(nearest, dist)
+            landmark = open_positions[[np.argmax(nearest[open_positions])]]
+
+        u = np.concatenate([e[0] for e in edges]).astype(np.int64)
+        v = np.concatenate([e[1] for e in edges]).astype(np.int64)
+        w = np.concatenate([e[2] for e in edges]).astype(np.int32)
+        order = np.argsort(u, kind="stable")
+        indptr = np.zeros(len(node_cells) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(u, minlength=len(node_cells)), out=indptr[1:])
+        return {"node_cells": node_cells.astype(np.int64), "indptr": indptr,
+                "indices": v[order].astype(np.int32), "weights": w[order], "landmark_dist": landmark_dist}
+
+    def _search_cluster(self, cluster, cell):
+        return _ClusterSearch(self.grid, cluster // self.cluster_cols * self.cluster_size,
+                              cluster % self.cluster_cols * self.cluster_size, self.cluster_size, cell)
+
+    def _segment(self, a, b):
+        key = (a, b)
+        cells = self._segments.get(key)
+        if cells is None:
+            target = self._node_cells[b]
+            cells = self._search_cluster(self._cluster(*target), target).path_from(self._node_cells[a])
+            self._segments[key] = cells
+            if len(self._segments) > self.segment_cache_size:
+                self._segments.popitem(last=False)
+        else:
+            self._segments.move_to_end(key)
+        return cells
+
+    def query(self, start, goal, stats=None):
+        start_time = time.time()
+        rows, cols = self.shape
+        if not all(0 <= r < rows and 0 <= c < cols and self.grid[r, c] == 0 for r, c in (start, goal)):
+            return None, 0, time.time() - start_time
+        start, goal = (int(start[0]), int(start[1])), (int(goal[0]), int(goal[1]))
+        start_cluster, goal_cluster = self._cluster(*start), self._cluster(*goal)
+        node_cells, neighbors = self._node_cells, self._neighbors
+
+        # Link the start and the goal to the entrances of their clusters. The goal is the
+        # extra node num_nodes, reached from its cluster's entrances (or straight from the
+        # start when both share a cluster and a path inside it exists).
+        from_start = self._search_cluster(start_cluster, start)
+        to_goal = self._search_cluster(goal_cluster, goal)
+        goal_links = {}
+        for node in self._cluster_nodes.get(goal_cluster, ()):
+            d = to_goal.distance(node_cells[node])
+            if d >= 0:
+                goal_links[node] = d
+        goal_node = self.num_nodes
+        gr, gc = goal
+        # Bounds on each landmark's distance to the goal from its cluster's entrances:
+        # d(L, e) - d(e, goal) <= d(L, goal) <= d(L, e) + d(e, goal).
+        bounds = []
+        for landmark in self._landmark_dist:
+            linked = [(landmark[node], d) for node, d in goal_links.items() if landmark[node] >= 0]
+            if linked:
+                bounds.append((landmark, min(dl + d for dl, d in linked), max(dl - d for dl, d in linked)))
+
+        estimates = {}
+
+        def heuristic(node):
+            h = estimates.get(node)
+            if h is None:
+                r, c = node_cells[node]
+                h = abs(r - gr) + abs(c - gc)
+                for landmark, upper, lower in bounds:
+                    dl = landmark[node]
+                    if dl >= 0:
+                        if dl - upper > h:
+                            h = dl - upper
+                        if lower - dl > h:
+                            h = lower - dl
+                estimates[node] = h
+            return h
+
+        best, parent, open_set = {}, {}, []
+        for node in self._cluster_nodes.get(start_cluster, ()):
+            d = from_start.distance(node_cells[node])
+            if d >= 0:
+                best[node], parent[node] = d, -1
+                open_set.append((d + heuristic(node), d, node))
+        if start_cluster == goal_cluster and from_start.distance(goal) >= 0:
+            best[goal_node], parent[goal_node] = from_start.distance(goal), -1
+            open_set.append((best[goal_node], best[goal_node], goal_node))
+        heapq.heapify(open_set)
+        pushes, pops, expanded = len(open_set), 0, 0
+
+        # A* over the abstract graph.
+        while open_set:
+            _, d, u = heapq.heappop(open_set)
+            pops += 1
+            if d > best[u]:
+                continue
+            if u == goal_node:
+                break
+            expanded += 1
+            for v, w in neighbors[u]:
+                nd = d + w
+                if nd < best.get(v, INF):
+                    best[v], parent[v] = nd, u
+                    heapq.heappush(open_set, (nd + heuristic(v), nd, v))
+                    pushes += 1
+            if u in goal_links:
+                nd = d + goal_links[u]
+                if nd < best.get(goal_node, INF):
+                    best[goal_node], parent[goal_node] = nd, u
+                    heapq.heappush(open_set, (nd, nd, goal_node))
+                    pushes += 1
+        if stats is not None:
+            stats.update({"expanded": expanded, "heap_pushes": pushes, "heap_pops": pops})
+        if goal_node not in best:
+            return None, 0, time.time() - start_time
+
+        # Refine the abstract path into cells: border crossings are single steps between
+        # neighbouring cells, the other abstract steps are paths inside one cluster.
+        nodes = []
+        u = parent[goal_node]
+        while u != -1:
+            nodes.append(u)
+            u = parent[u]
+        nodes.reverse()
+        if not nodes:
+            return from_start.path_from(goal)[::-1], best[goal_node] + 1, time.time() - start_time
+        path = from_start.path_from(node_cells[nodes[0]])[::-1]
+        for a, b in zip(nodes, nodes[1:]):
+            if self._cluster(*node_cells[a]) == self._cluster(*node_cells[b]):
+                path.extend(self._segment(a, b)[1:])
+            else:
+                path.append(node_cells[b])
+        path.extend(to_goal.path_from(node_cells[nodes[-1]])[1:])
+        runtime = time.time() - start_time
+        return path, len(path), runtime
+
+# BFS from one cell over the open cells of a single cluster, on a copy of the cluster
+# padded with walls. distance(cell) and path_from(cell) (cell -> ... -> source) answer
+# for cells of that cluster.
+class _ClusterSearch:
+    def __init__(self, grid, r0, c0, size, source):
+        block = grid[r0:r0 + size, c0:c0 + size] == 0
+        self.r0, self.c0 = r0 - 1, c0 - 1
+        self.width = width = block.shape[1] + 2
+        open_cells = bytearray(np.pad(block, 1).astype(np.uint8).tobytes())
+        came = [-1] * len(open_cells)
+        dist = [-1] * len(open_cells)
+        source = self._pos(source)
+        came[source], dist[source] = source, 0
+        open_cells[source] = 0
+        queue = [source]
+        for u in queue:
+            du = dist[u] + 1
+            for v in (u - width, u + width, u - 1, u + 1):
+                if open_cells[v]:
+                    open_cells[v] = 0
+                    came[v], dist[v] = u, du
+                    queue.append(v)
+        self.came, self.dist = came, dist
+
+    def _pos(self, cell):
+        return (cell[0] - self.r0) * self.width + cell[1] - self.c0
+
+    def distance(self, cell):
+        return self.dist[self._pos(cell)]
+
+    def path_from(self, cell):
+        pos, came, width = self._pos(cell), self.came, self.width
+        path = []
+        while True:
+            r, c = divmod(pos, width)
+            path.append((r + self.r0, c + self.c0))
+            if came[pos] == pos:
+                return path
+            pos = came[pos]
+
+# Planners of recently solved mazes in this process, by (wall layout, cluster size), so
+# solve_hpa pays the preprocessing (or the load from disk) once per maze.
+_planners = OrderedDict()
+planner_cache_size = 4
+
+def _fingerprint(maze):
+    # A MazeGraph keeps its fingerprint, so repeated solves on one graph hash it once.
+    if isinstance(maze, MazeGraph):
+        return maze.fingerprint()
+    return maze_fingerprint(np.asarray(maze) == 0)
+
+def hpa_cache_path(maze, cluster_size=16, cache_dir=DEFAULT_CACHE_DIR, landmarks=8):
+    return Path(cache_dir) / f"hpa-{cluster_size}-{landmarks}-{_fingerprint(maze)}.npz"
+
+def load_hpa(maze, cluster_size=16, cache_dir=DEFAULT_CACHE_DIR, landmarks=8):
+    # HPAStar for this maze, with the abstract graph read from the maze cache directory
+    # when an earlier run already built it for the same wall layout, built and stored otherwise.
+    grid = np.asarray(maze.maze if isinstance(maze, MazeGraph) else maze)
+    path = hpa_cache_path(maze, cluster_size, cache_dir, landmarks)
+    if path.exists():
+        with np.load(path) as data:
+            return HPAStar(grid, cluster_size, {field: data[field] for field in abstract_fields}, landmarks)
+    planner = HPAStar(grid, cluster_size, landmarks=landmarks)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Written under a temporary name and renamed, so concurrent runs never read a partial file.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **planner.arrays())
+    os.replace(tmp_path, path)
+    return planner
+
+def cached_hpa(maze, cluster_size=16, cache_dir=None):
+    # cache_dir: also keep the abstract graph on disk there (through load_hpa); by default
+    # it only lives in this process.
+    key = (_fingerprint(maze), cluster_size)
+    planner = _planners.get(key)
+    if planner is None:
+        planner = load_hpa(maze, cluster_size, cache_dir) if cache_dir is not None else HPAStar(maze, cluster_size)
+        _planners[key] = planner
+        while len(_planners) > planner_cache_size:
+            _planners.popitem(last=False)
+    _planners.move_to_end(key)
+    return planner
+
+def solve_hpa(maze, start, goal, stats=None, cluster_size=16, cache_dir=None):
+    # Same contract as the other solvers. The first solve on a maze in a process also
+    # builds its abstract graph (or loads it from cache_dir, when given); later ones only
+    # run the query.
+    start_time = time.time()
+    path, steps, _ = cached_hpa(maze, cluster_size, cache_dir).query(start, goal, stats=stats)
+    return path, steps, time.time() - start_time
@@ -0,0 +1,86 @@
+import sys
+import time
+import tracemalloc
+
+# Measures one solver call. Timings come from perf_counter_ns (wall) and process_time_ns
+# (CPU); the solver's own counters (nodes expanded, frontier high-water mark, heap
+# pushes/pops, Bellman sweeps) come from the stats dict every solver fills.
+#
+# Peak memory has two probes:
+# - "rss" (default): on Linux the kernel's peak-RSS counter is reset before the solve and
+#   read after it, so the figure is the solve's own high-water mark above the RSS it
+#   started from. It costs two small /proc accesses per solve, cheap enough to leave on.
+#   Elsewhere it falls back to the growth of ru_maxrss, which only shows new peaks.
+# - "tracemalloc": exact Python and NumPy allocation peaks, but it slows the pure-Python
+#   search loops down many times over, so runtimes taken with it are not comparable.
+# memory=None skips memory measurement.
+
+def _read_status_kb(field):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def _max_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, kB elsewhere.
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+def instrumented_solve(solve_func, maze, start, goal, memory="rss", **params):
+    # Returns (path, steps, runtime, metrics). runtime is the solver's own figure; metrics
+    # holds wall_ns, cpu_ns, peak_memory_kb (None when not measured) and the solver stats.
+    if memory not in ("rss", "tracemalloc", None):
+        raise ValueError(f"Unknown memory probe: {memory}")
+    stats = {}
+    baseline_kb = None
+    if memory == "rss":
+        if _reset_peak_rss():
+            baseline_kb, peak_field = _read_status_kb("VmRSS:"), "VmHWM:"
+        else:
+            baseline_kb, peak_field = _max_rss_kb(), None
+    elif memory == "tracemalloc":
+        was_tracing = tracemalloc.is_tracing()
+        if was_tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+        traced_before = tracemalloc.get_traced_memory()[0]
+
+    cpu_start = time.process_time_ns()
+    wall_start = time.perf_counter_ns()
+    try:
+        path, steps, runtime = solve_func(maze, start, goal, stats=stats, **params)
+        wall_ns = time.perf_counter_ns() - wall_start
+        cpu_ns = time.process_time_ns() - cpu_start
+    finally:
+        if memory == "tracemalloc":
+            traced_peak = tracemalloc.get_traced_memory()[1]
+            if not was_tracing:
+                tracemalloc.stop()
+
+    peak_kb = None
+    if memory == "rss" and baseline_kb is not None:
+        peak = _read_status_kb(peak_field) if peak_field else _max_rss_kb()
+        if peak is not None:
+            peak_kb = max(peak - baseline_kb, 0)
+    elif memory == "tracemalloc":
+        peak_kb = (traced_peak - traced_before) // 1024
+
+    metrics = {"wall_ns": wall_ns, "cpu_ns": cpu_ns, "peak_memory_kb": peak_kb, **stats}
+    return path, steps, runtime, metrics
@@ -0,0 +1,127 @@
+import time
+import heapq
+import numpy as np
+from maze_generator.graph import MazeGraph
+
+def solve_jps(maze, start, goal, stats=None):
+    # Jump Point Search for 4-connected uniform-cost grids. Straight runs are scanned
+    # without touching the open list; only cells where the search may need to turn
+    # (jump points) are pushed. Horizontal moves keep both vertical turns, and a vertical
+    # run stops wherever a horizontal scan from it would find a jump point, which keeps
+    # the result optimal with orthogonal moves only.
+    start_time = time.time()
+    grid = maze.maze if isinstance(maze, MazeGraph) else maze
+    rows, cols = grid.shape
+    if not all(0 <= r < rows and 0 <= c < cols and grid[r, c] == 0 for r, c in (start, goal)):
+        return None, 0, time.time() - start_time
+
+    # Passability of a copy padded with one wall cell on every side, as a flat bytearray,
+    # so no scan needs a bounds check.
+    width = cols + 2
+    walkable = bytearray(np.pad(np.asarray(grid) == 0, 1).astype(np.uint8).tobytes())
+    start_pos = (start[0] + 1) * width + start[1] + 1
+    goal_pos = (goal[0] + 1) * width + goal[1] + 1
+    goal_row, goal_col = divmod(goal_pos, width)
+
+    def jump_horizontal(pos, d):
+        while True:
+            pos += d
+            if not walkable[pos]:
+                return -1
+            if pos == goal_pos:
+                return pos
+            if (walkable[pos - width] and not walkable[pos - d - width]) or \
+               (walkable[pos + width] and not walkable[pos - d + width]):
+                return pos
+
+    def jump_vertical(pos, d):
+        while True:
+            pos += d
+            if not walkable[pos]:
+                return -1
+            if pos == goal_pos:
+                return pos
+            if (walkable[pos - 1] and not walkable[pos - d - 1]) or \
+               (walkable[pos + 1] and not walkable[pos - d + 1]):
+                return pos
+            if jump_horizontal(pos, 1) >= 0 or jump_horizontal(pos, -1) >= 0:
+                return pos
+
+    def heuristic(pos):
+        r, c = divmod(pos, width)
+        return abs(r - goal_row) + abs(c - goal_col)
+
+    # Jump points are sparse, so their scores live in dicts rather than grid-sized arrays.
+    # Heap keys are packed (f, deepest g first, position) ints as in solve_astar.
+    bits = len(walkable).bit_length()
+    pos_mask = (1 << bits) - 1
+    g_score = {start_pos: 0}
+    parent = {start_pos: start_pos}
+    closed = set()
+    open_set = [((heuristic(start_pos) << bits | pos_mask) << bits) | start_pos]
+    pushes, pops, frontier_max = 1, 0, 1
+    found = False
+    while open_set:
+        current = heapq.heappop(open_set) & pos_mask
+        pops += 1
+        if current in closed:
+            continue
+        closed.add(current)
+        if current == goal_pos:
+            found = True
+            break
+
+        previous = parent[current]
+        if previous == current:
+            directions = (1, -1, width, -width)
+        elif abs(current - previous) < width:
+            step = 1 if current > previous else -1
+            directions = (step, width, -width)
+        else:
+            step = width if current > previous else -width
+            directions = (step, 1, -1)
+        for d in directions:
+            if d == 1 or d == -1:
+                jump_point = jump_horizontal(current, d)
+            else:
+                jump_point = jump_vertical(current, d)
+            if jump_point < 0 or jump_point in closed:
+                continue
+            distance = abs(jump_point - current)
+            new_cost = g_score[current] + (distance if distance < width else distance // width)
+            if new_cost < g_score.get(jump_point, new_cost + 1):
+                g_score[jump_point] = new_cost
+                parent[jump_point] = current
+                f = new_cost + heuristic(jump_point)
+                heapq.heappush(open_set, ((f << bits | (pos_mask - new_cost)) << bits) | jump_point)
+                pushes += 1
+        if len(open_set) > frontier_max:
+            frontier_max = len(open_set)
+
+    if stats is not None:
+        stats["expanded"] = len(closed)
+        stats["heap_pushes"] = pushes
+        stats["heap_pops"] = pops
+        stats["frontier_max"] = frontier_max
+    if not found:
+        return None, 0, time.time() - start_time
+
+    # Fill in the straight runs between consecutive jump points.
+    path = [goal_pos]
+    pos = goal_pos
+    while pos != start_pos:
+        previous = parent[pos]
+        d = width if abs(pos - previous) >= width else 1
+        d = -d if previous < pos else d
+        cell = pos
+        while cell != previous:
+            cell += d
+            path.append(cell)
+        pos = previous
+    path.reverse()
+    path = [(p // width - 1, p % width - 1) for p in path]
+    runtime = time.time() - start_time
+    return path, len(path), runtime
+
+if __name__ == "__main__":
+    pass
\ No newline at end of file
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+import numpy as np
+
+# LRU cache of converged MDP solutions, bounded by the bytes of the arrays it holds.
+# An entry keeps the value function V and the greedy next-hop array of one solve, so a
+# repeated query for the same maze and goal (from any start) is a walk along the next
+# hops: O(path length). Keys carry the maze fingerprint, goal, solver kind, discount,
+# theta, solver variant and dtype; nearest_values finds a V of the same maze, goal and
+# kind under other parameters to warm-start a new solve.
+class MDPCache:
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(graph, goal_id, kind, discount, theta, variant, dtype):
+        return (graph.fingerprint(), int(goal_id), kind, float(discount), float(theta), variant,
+                np.dtype(dtype).name)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, V, successor):
+        if key in self.entries:
+            self._remove(key)
+        size = V.nbytes + successor.nbytes
+        if size > self.max_bytes:
+            return
+        while self.nbytes + size > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+        # Read-only copies: no caller can change a cached solution in place, and the
+        # caller's own arrays stay writable.
+        V, successor = V.copy(), successor.copy()
+        V.setflags(write=False)
+        successor.setflags(write=False)
+        self.entries[key] = (V, successor)
+        self.nbytes += size
+
+    def nearest_values(self, fingerprint, goal_id, kind):
+        # Most recently used V for the same maze, goal and kind under any other parameters.
+        for key in reversed(self.entries):
+            if key[0] == fingerprint and key[1] == goal_id and key[2] == kind:
+                return self.entries[key][0]
+        return None
+
+    def _remove(self, key):
+        V, successor = self.entries.pop(key)
+        self.nbytes -= V.nbytes + successor.nbytes
+
+    def __len__(self):
+        return len(self.entries)
@@ -1,92 +1,158 @@
 import time
 import numpy as np
+from alogrithms.parallel_sweeps import parallel_policy_sweeps
+from maze_generator.common import follow_successors
+from maze_generator.graph import as_graph, actions
 
-def solve_mdp_policy_iteration(maze, start, goal, discount=0.9, theta=0.001):
+def evaluate_policy_exact(successor, reward, discount):
+    # Solves (I - discount * P_pi) V = R for a deterministic policy. Every state follows a
+    # single chain that ends on a cycle (the goal's zero-reward self-loop, a wall bump or a
+    # loop between cells), so V(s) = sum_k discount^k * reward(succ^k(s)). Pointer doubling
+    # adds up 2^j steps of every chain per pass and stops once the discounted tail is below
+    # float resolution: O(log) vectorized passes over the passable cells, no linear solver.
+    if not discount < 1:
+        raise ValueError("Exact policy evaluation needs discount < 1.")
+    V = reward.copy()
+    jump = successor.copy()
+    scale = discount
+    bound = np.max(np.abs(reward), initial=0.0) / (1 - discount)
+    while scale * bound > np.finfo(V.dtype).eps * max(bound, 1.0):
+        V += scale * V[jump]
+        jump = jump[jump]
+        scale *= scale
+    return V
+
+def evaluate_policy_iterative(successor, reward, discount, theta, V, max_sweeps=None, workers=None):
+    # workers: split each sweep into row bands on that many threads (same result).
+    if workers is not None:
+        return parallel_policy_sweeps(successor, reward, discount, theta, V, max_sweeps, workers)
+    sweeps = 0
+    while True:
+        V_new = reward + discount * V[successor]
+        delta = np.max(np.abs(V_new - V), initial=0.0)
+        V = V_new
+        sweeps += 1
+        if delta < theta or (max_sweeps is not None and sweeps >= max_sweeps):
+            return V, delta, sweeps
+
+def solve_mdp_policy_iteration(maze, start, goal, discount=0.9, theta=0.001, evaluation="exact", sweeps=5,
+                               dtype=np.float64, stats=None, seed=None, cache=None, warm_start=False, workers=None):
+    # cache / warm_start as in solve_mdp_value_iteration: a hit follows the cached policy,
+    # and a warm start begins from the greedy policy of a cached V (and that V itself for
+    # the iterative evaluation modes) instead of a random policy. workers runs the sweeps
+    # of the iterative evaluation modes in row bands on that many threads.
     start_time = time.time()
-    rows, cols = maze.shape
-    passable = (maze == 0)
-    
-    r_idx, c_idx = np.indices((rows, cols))
+    graph = as_graph(maze)
+    start_id, goal_id = graph.node(start), graph.node(goal)
+    if start_id < 0 or goal_id < 0:
+        raise ValueError("Start or Goal state is not passable!")
+    if evaluation not in ("exact", "iterative", "modified"):
+        raise ValueError(f"Unknown policy evaluation mode: {evaluation}")
+
+    V0 = None
+    if cache is not None:
+        key = cache.key(graph, goal_id, "policy", discount, theta, evaluation, dtype)
+        entry = cache.get(key)
+        if stats is not None:
+            stats["cache_hit"] = entry is not None
+        if entry is not None:
+            path = follow_successors(entry[1], start_id, goal_id, graph.coords)
+            return path, len(path), time.time() - start_time
+        if warm_start:
+            V0 = cache.nearest_values(graph.fingerprint(), goal_id, "policy")
 
-    actions = np.array([[-1, 0],
-                        [ 1, 0],
-                        [ 0, -1],
-                        [ 0,  1]])
     num_actions = actions.shape[0]
-    
+    num_states = graph.num_nodes
+    state_ids = np.arange(num_states, dtype=np.int32)
 
-    V = np.zeros((rows, cols))
-    policy = -1 * np.ones((rows, cols), dtype=int)
-    random_policy = np.random.randint(0, num_actions, size=(rows, cols))
-    mask = passable.copy()
-    mask[goal] = False
-    policy[mask] = random_policy[mask]
-    
-    def safe_next_state(a_idx):
-        dr, dc = actions[a_idx]
-        cand_r = r_idx + dr
-        cand_c = c_idx + dc
-        in_bounds = (cand_r >= 0) & (cand_r < rows) & (cand_c >= 0) & (cand_c < cols)
-        valid = np.zeros_like(in_bounds, dtype=bool)
-        valid[in_bounds] = passable[cand_r[in_bounds], cand_c[in_bounds]]
-        next_r = np.where(valid, cand_r, r_idx)
-        next_c = np.where(valid, cand_c, c_idx)
-        return next_r, next_c
+    # Everything lives on the passable cells only, in action-major int32/`dtype` tables
+    # built once; nothing grid-sized is allocated after the graph.
+    next_states = graph.next_states(action_major=True)
+    rewards = np.full(next_states.shape, -1, dtype=dtype)
+    rewards[next_states == goal_id] = 0
 
+    if V0 is None:
+        V = np.zeros(num_states, dtype=dtype)
+        # The initial policy is random; a seed makes it reproducible without touching np.random.
+        random_state = np.random if seed is None else np.random.RandomState(seed)
+        policy = random_state.randint(0, num_actions, size=num_states).astype(np.int8)
+    else:
+        V = np.array(V0, dtype=dtype)
+        policy = np.zeros(num_states, dtype=np.int8)
+        best_vals = rewards[0] + discount * V[next_states[0]]
+        for a in range(1, num_actions):
+            vals = rewards[a] + discount * V[next_states[a]]
+            better = vals > best_vals
+            best_vals[better] = vals[better]
+            policy[better] = a
+        del best_vals
+    update_mask = state_ids != goal_id
+    tolerance_eps = 16 * np.finfo(dtype).eps
+
+    def policy_graph(policy):
+        # The goal is absorbing with value 0: a zero-reward self-loop.
+        successor = next_states[policy, state_ids]
+        reward = rewards[policy, state_ids]
+        successor[goal_id] = goal_id
+        reward[goal_id] = 0
+        return successor, reward
 
-    cand_r = np.empty((num_actions, rows, cols), dtype=int)
-    cand_c = np.empty((num_actions, rows, cols), dtype=int)
-    for a in range(num_actions):
-        cand_r[a], cand_c[a] = safe_next_state(a)
-    
-    def compute_candidate_values():
-        reward = np.where((cand_r == goal[0]) & (cand_c == goal[1]), 0, -1)
-        candidate_vals = reward + discount * V[cand_r, cand_c]
-        return candidate_vals
-    
     policy_stable = False
     iteration = 0
+    # Bellman sweeps: one improvement sweep per iteration plus the evaluation sweeps of
+    # the iterative modes (exact evaluation is a direct solve).
+    total_sweeps = 0
     while not policy_stable:
         iteration += 1
-        while True:
-            candidate_vals = compute_candidate_values()
-            update_mask = (policy != -1)
-            V_new = V.copy()
-            idx = np.where(update_mask)
-            V_new[idx] = candidate_vals[policy[idx], idx[0], idx[1]]
-            delta = np.max(np.abs(V_new - V))
-            V = V_new
-            if delta < theta:
-                break
+        successor, reward = policy_graph(policy)
+        if evaluation == "exact":
+            V = evaluate_policy_exact(successor, reward, discount)
+            delta = 0.0
+        elif evaluation == "iterative":
+            V, delta, eval_sweeps = evaluate_policy_iterative(successor, reward, discount, theta, V, workers=workers)
+            total_sweeps += eval_sweeps
+        else:
+            V, delta, eval_sweeps = evaluate_policy_iterative(successor, reward, discount, theta, V, max_sweeps=sweeps,
+                                                              workers=workers)
+            total_sweeps += eval_sweeps
 
-        candidate_vals = compute_candidate_values()
-        best_actions = np.argmax(candidate_vals, axis=0)
-        new_policy = policy.copy()
-        new_policy[update_mask] = best_actions[update_mask]
-        if np.all(new_policy[update_mask] == policy[update_mask]):
+        # Greedy improvement one action at a time, keeping temporaries O(num_states).
+        total_sweeps += 1
+        current_vals = reward + discount * V[successor]
+        best_vals = current_vals.copy()
+        best_actions = policy.copy()
+        for a in range(num_actions):
+            vals = rewards[a] + discount * V[next_states[a]]
+            better = vals > best_vals
+            best_vals[better] = vals[better]
+            best_actions[better] = a
+        # Only switch on an improvement above float noise, so the policy cannot flip
+        # forever between actions that are tied once far-away values saturate.
+        improves = best_vals > current_vals + tolerance_eps * (1 + np.abs(current_vals))
+        improves &= update_mask
+        if not improves.any() and delta < theta:
             policy_stable = True
         else:
-            policy = new_policy
+            policy[improves] = best_actions[improves]
 
     print(f"Policy Iteration converged after {iteration} iterations.")
+    if stats is not None:
+        stats["iterations"] = iteration
+        stats["sweeps"] = total_sweeps
+    if cache is not None:
+        cache.put(key, V, policy_graph(policy)[0])
 
-    path = [start]
-    current = start
-    for _ in range(10000):
-        if current == goal:
-            break
-        r, c = current
-        a = policy[r, c]
-        if a == -1:
-            print("No valid action found at state", current, "stopping path extraction.")
+    path = [graph.cell(start_id)]
+    current = start_id
+    for _ in range(num_states):
+        if current == goal_id:
             break
-        next_r, next_c = safe_next_state(a)
-        next_state = (next_r[r, c], next_c[r, c])
+        next_state = int(next_states[policy[current], current])
         if next_state == current:
-            print("Stuck in local optimum at", current, "stopping path extraction.")
+            print("Stuck in local optimum at", graph.cell(current), "stopping path extraction.")
             break
         current = next_state
-        path.append(current)
+        path.append(graph.cell(current))
 
     runtime = time.time() - start_time
     return path, len(path), runtime
@@ -1,68 +1,204 @@
 import time
+import heapq
+import numpy as np
+from alogrithms.parallel_sweeps import parallel_value_sweeps
+from maze_generator.common import follow_successors
+from maze_generator.graph import as_graph
 
-def solve_mdp_value_iteration(maze, start, goal, discount=0.99, theta=0.001):
-    start_time = time.time()
-
-    start = (int(start[0]), int(start[1]))
-    goal = (int(goal[0]), int(goal[1]))
+def compile_mdp(graph, goal_id, goal_reward=1.0, step_reward=-0.01, dtype=np.float64):
+    # Action-major (num_actions, num_states) tables over the passable cells only. State ids
+    # are the graph's int32 node ids; values and rewards use `dtype` (float32 halves the
+    # memory of every value-sized array).
+    next_states = graph.next_states(action_major=True)
+    rewards = np.full(next_states.shape, step_reward, dtype=dtype)
+    rewards[next_states == goal_id] = goal_reward
+    return next_states, rewards
 
-    rows, cols = maze.shape
-    states = {(r, c) for r in range(rows) for c in range(cols) if maze[r, c] == 0}
+def value_iteration(next_states, rewards, goal_id, discount=0.99, theta=0.001, mode="sync", stats=None, V0=None,
+                    workers=None):
+    # V0 warm-starts the iteration (e.g. from a V converged under another discount or
+    # theta); Bellman backups contract from any starting point, so every mode accepts it.
+    # mode="parallel" runs the "sync" sweeps in row bands on `workers` threads.
+    if V0 is not None:
+        V0 = np.array(V0, dtype=rewards.dtype)
+        V0[goal_id] = 0.0
+    if mode == "sync":
+        V, sweeps, backups = _synchronous_sweeps(next_states, rewards, goal_id, discount, theta, V0)
+    elif mode == "gauss_seidel":
+        V, sweeps, backups = _gauss_seidel_sweeps(next_states, rewards, goal_id, discount, theta, V0)
+    elif mode == "prioritized":
+        V, sweeps, backups = _prioritized_sweeping(next_states, rewards, goal_id, discount, theta, V0)
+    elif mode == "parallel":
+        V = np.zeros(rewards.shape[1], dtype=rewards.dtype) if V0 is None else V0
+        V, _, sweeps = parallel_value_sweeps(next_states, rewards, goal_id, discount, theta, V, workers)
+        backups = sweeps * len(V)
+    else:
+        raise ValueError(f"Unknown value iteration mode: {mode}")
+    if stats is not None:
+        stats["sweeps"] = sweeps
+        stats["backups"] = backups
+    return V
 
-    if start not in states or goal not in states:
-        raise ValueError("Start or Goal state is not passable!")
+def _synchronous_sweeps(next_states, rewards, goal_id, discount, theta, V0=None):
+    num_actions, num_states = next_states.shape
+    V = np.zeros(num_states, dtype=rewards.dtype) if V0 is None else V0
+    V_new = np.empty_like(V)
+    Q = np.empty_like(V)
+    diff = np.empty_like(V)
+    sweeps = 0
+    while True:
+        # One synchronous Bellman sweep: gather successor values and keep a running max
+        # over actions, so only state-sized buffers are needed.
+        for a in range(num_actions):
+            target = V_new if a == 0 else Q
+            np.take(V, next_states[a], out=target)
+            target *= discount
+            target += rewards[a]
+            if a:
+                np.maximum(V_new, Q, out=V_new)
+        V_new[goal_id] = 0.0
+        np.subtract(V_new, V, out=diff)
+        np.abs(diff, out=diff)
+        delta = diff.max() if num_states else 0.0
+        V, V_new = V_new, V
+        sweeps += 1
+        if delta < theta:
+            break
+    return V, sweeps, sweeps * num_states
 
-    actions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+def _initial_values(rewards, goal_id, discount):
+    # Value of never reaching the goal: a lower bound on V*, and already exact for
+    # states cut off from the goal, so the in-place modes only have to push the
+    # goal reward outwards.
+    V = np.zeros(rewards.shape[1], dtype=rewards.dtype)
+    if discount < 1 and rewards.size:
+        V[:] = min(rewards.min(), 0.0) / (1 - discount)
+    V[goal_id] = 0.0
+    return V
 
-    transitions = {}
-    for s in states:
-        r, c = s
-        transitions[s] = {}
-        for a in actions:
-            ns = (r + a[0], c + a[1])
-            if ns not in states:
-                ns = s
-            transitions[s][a] = ns
-            
-    V = {s: 0.0 for s in states}
+def _goal_bfs_layers(next_states, goal_id):
+    seen = np.zeros(next_states.shape[1], dtype=bool)
+    seen[goal_id] = True
+    frontier = np.array([goal_id])
+    layers = []
+    while frontier.size:
+        frontier = np.unique(next_states[:, frontier])
+        frontier = frontier[~seen[frontier]]
+        seen[frontier] = True
+        if frontier.size:
+            layers.append(frontier)
+    unreachable = np.flatnonzero(~seen)
+    if unreachable.size:
+        layers.append(unreachable)
+    return layers
 
+def _gauss_seidel_sweeps(next_states, rewards, goal_id, discount, theta, V0=None):
+    V = _initial_values(rewards, goal_id, discount) if V0 is None else V0
+    # A grid graph is bipartite, so cells in one BFS layer never depend on each other and
+    # each layer can be backed up as one in-place block, in order of distance from the goal.
+    layers = _goal_bfs_layers(next_states, goal_id)
+    order = np.concatenate(layers) if layers else np.empty(0, dtype=np.intp)
+    bounds = np.cumsum([0] + [len(layer) for layer in layers]).tolist()
+    order_next = next_states[:, order]
+    order_rewards = rewards[:, order]
+    sweeps = 0
     while True:
         delta = 0.0
-        newV = {}
-        for s in states:
-            if s == goal:
-                newV[s] = 0.0
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            block = order[lo:hi]
+            new = np.max(order_rewards[:, lo:hi] + discount * V[order_next[:, lo:hi]], axis=0)
+            delta = max(delta, np.max(np.abs(new - V[block])))
+            V[block] = new
+        sweeps += 1
+        if delta < theta:
+            break
+    return V, sweeps, sweeps * len(order)
+
+def _prioritized_sweeping(next_states, rewards, goal_id, discount, theta, V0=None):
+    if V0 is None:
+        V0 = _initial_values(rewards, goal_id, discount)
+    residual = np.abs(np.max(rewards + discount * V0[next_states], axis=0) - V0)
+    residual[goal_id] = 0.0
+    V = V0.tolist()
+    nxt = next_states.T.tolist()
+    rwd = rewards.T.tolist()
+
+    def backup(s):
+        best = float('-inf')
+        for r, ns in zip(rwd[s], nxt[s]):
+            val = r + discount * V[ns]
+            if val > best:
+                best = val
+        return best
+
+    priority = np.where(residual >= theta, residual, 0.0).tolist()
+    heap = [(-priority[s], s) for s in np.flatnonzero(residual >= theta).tolist()]
+    heapq.heapify(heap)
+    backups = 0
+    while heap:
+        p, s = heapq.heappop(heap)
+        if -p != priority[s]:
+            continue
+        priority[s] = 0.0
+        V[s] = backup(s)
+        backups += 1
+        # Transitions are symmetric, so the states that can reach s are its neighbours.
+        for ps in nxt[s]:
+            if ps == s or ps == goal_id:
                 continue
+            res = abs(backup(ps) - V[ps])
+            if res >= theta and res > priority[ps]:
+                priority[ps] = res
+                heapq.heappush(heap, (-res, ps))
+    # No sweeps as such: report the backups in full-sweep equivalents, rounded up.
+    return np.array(V, dtype=rewards.dtype), -(-backups // len(V)), backups
 
-            best_val = float('-inf')
-            for a in actions:
-                ns = transitions[s][a]
-                rwd = 1.0 if ns == goal else -0.01
-                val = rwd + discount * V[ns]
-                best_val = max(best_val, val)
+def greedy_successors(next_states, rewards, V, discount):
+    # Column by column keeps this O(num_states) in memory; strict > keeps the first best action.
+    best_vals = rewards[0] + discount * V[next_states[0]]
+    best_next = next_states[0].copy()
+    for a in range(1, len(next_states)):
+        vals = rewards[a] + discount * V[next_states[a]]
+        better = vals > best_vals
+        best_vals[better] = vals[better]
+        best_next[better] = next_states[a, better]
+    return best_next
 
-            newV[s] = best_val
-            delta = max(delta, abs(newV[s] - V[s]))
-        V = newV
-        if delta < theta:
-            break
+def solve_mdp_value_iteration(maze, start, goal, discount=0.99, theta=0.001, mode="sync", dtype=np.float64, stats=None,
+                              cache=None, warm_start=False, workers=None):
+    # cache: an MDPCache; a hit answers from the cached next hops without iterating.
+    # warm_start: on a miss, start from a cached V of the same maze and goal computed
+    # under another discount, theta or mode.
+    start_time = time.time()
 
-    s = start
-    path = [s]
-    while s != goal:
-        best_val = float('-inf')
-        best_ns = s
-        for a in actions:
-            ns = transitions[s][a]
-            rwd = 1.0 if ns == goal else -0.01
-            val = rwd + discount * V[ns]
-            if val > best_val:
-                best_val = val
-                best_ns = ns
-        if best_ns == s:
-            break
-        s = best_ns
-        path.append(s)
+    start = (int(start[0]), int(start[1]))
+    goal = (int(goal[0]), int(goal[1]))
+
+    graph = as_graph(maze)
+    start_id, goal_id = graph.node(start), graph.node(goal)
+
+    if start_id < 0 or goal_id < 0:
+        raise ValueError("Start or Goal state is not passable!")
+
+    V0 = None
+    if cache is not None:
+        key = cache.key(graph, goal_id, "value", discount, theta, mode, dtype)
+        entry = cache.get(key)
+        if stats is not None:
+            stats["cache_hit"] = entry is not None
+        if entry is not None:
+            path = follow_successors(entry[1], start_id, goal_id, graph.coords)
+            return path, len(path), time.time() - start_time
+        if warm_start:
+            V0 = cache.nearest_values(graph.fingerprint(), goal_id, "value")
+
+    next_states, rewards = compile_mdp(graph, goal_id, dtype=dtype)
+    V = value_iteration(next_states, rewards, goal_id, discount, theta, mode=mode, stats=stats, V0=V0,
+                        workers=workers)
+    successor = greedy_successors(next_states, rewards, V, discount)
+    if cache is not None:
+        cache.put(key, V, successor)
+    path = follow_successors(successor, start_id, goal_id, graph.coords)
 
     runtime = time.time() - start_time
     return path, len(path), runtime
@@ -0,0 +1,69 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# Synchronous Bellman sweeps split into row bands that run on a thread pool. State ids
+# are row-major, so a contiguous id range is a band of maze rows, and a band's successors
+# reach at most one maze row into the bands above and below (its halo). Every sweep reads
+# the previous value array and writes its band's slice of the next one; the halo rows are
+# read from the neighbouring bands' slices of that previous array, so bands exchange halos
+# only at the barrier between sweeps. NumPy's take and ufunc loops release the GIL, so
+# threads sharing the arrays run the bands in parallel without copying any table into
+# multiprocessing shared memory. Convergence is checked on the largest residual of all
+# bands, and the result is the same as the single-threaded sweep, bit for bit.
+
+def state_bands(num_states, workers):
+    bounds = np.linspace(0, num_states, workers + 1).astype(int).tolist()
+    return [(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+def banded_sweeps(sweep_band, V, theta, workers=None, max_sweeps=None):
+    # sweep_band(lo, hi, V, V_new) writes V_new[lo:hi] from V and returns the band's
+    # largest residual. Returns (V, delta, sweeps); V's buffer is reused as scratch.
+    workers = workers or os.cpu_count() or 1
+    bands = state_bands(len(V), workers)
+    V_new = np.empty_like(V)
+    sweeps = 0
+    with ThreadPoolExecutor(max_workers=max(len(bands), 1)) as pool:
+        while True:
+            delta = max(pool.map(lambda band: sweep_band(band[0], band[1], V, V_new), bands), default=0.0)
+            V, V_new = V_new, V
+            sweeps += 1
+            if delta < theta or (max_sweeps is not None and sweeps >= max_sweeps):
+                return V, delta, sweeps
+
+def parallel_value_sweeps(next_states, rewards, goal_id, discount, theta, V, workers=None):
+    # Same backup as the "sync" value iteration mode, one band per task.
+    Q = np.empty_like(V)
+    diff = np.empty_like(V)
+
+    def sweep_band(lo, hi, V, V_new):
+        out, q, d = V_new[lo:hi], Q[lo:hi], diff[lo:hi]
+        for a in range(len(next_states)):
+            target = out if a == 0 else q
+            np.take(V, next_states[a, lo:hi], out=target)
+            target *= discount
+            target += rewards[a, lo:hi]
+            if a:
+                np.maximum(out, q, out=out)
+        if lo <= goal_id < hi:
+            out[goal_id - lo] = 0.0
+        np.subtract(out, V[lo:hi], out=d)
+        np.abs(d, out=d)
+        return d.max()
+
+    return banded_sweeps(sweep_band, V, theta, workers)
+
+def parallel_policy_sweeps(successor, reward, discount, theta, V, max_sweeps=None, workers=None):
+    # Iterative evaluation of a fixed policy, as evaluate_policy_iterative, one band per task.
+    diff = np.empty_like(V)
+
+    def sweep_band(lo, hi, V, V_new):
+        out, d = V_new[lo:hi], diff[lo:hi]
+        np.take(V, successor[lo:hi], out=out)
+        out *= discount
+        out += reward[lo:hi]
+        np.subtract(out, V[lo:hi], out=d)
+        np.abs(d, out=d)
+        return d.max()
+
+    return banded_sweeps(sweep_band, np.array(V, dtype=reward.dtype), theta, workers, max_sweeps)
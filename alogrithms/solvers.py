@@ -0,0 +1,28 @@
+from alogrithms.dfs_solver import solve_dfs
+from alogrithms.bfs_solver import solve_bfs
+from alogrithms.astar_solver import solve_astar
+from alogrithms.jps_solver import solve_jps
+from alogrithms.bidirectional_bfs_solver import solve_bidirectional_bfs
+from alogrithms.bidirectional_astar_solver import solve_bidirectional_astar
+from alogrithms.dstar_lite_solver import solve_dstar_lite
+from alogrithms.hpa_solver import solve_hpa
+from alogrithms.mdp_policy_solver import solve_mdp_policy_iteration
+from alogrithms.mdp_value_solver import solve_mdp_value_iteration
+
+# Every solver by the name the driver and the sweep runner use for it. All take
+# (maze, start, goal, stats=None, ...) and return (path, steps, runtime).
+solve_functions = {
+    "DFS": solve_dfs,
+    "BFS": solve_bfs,
+    "A*": solve_astar,
+    "JPS": solve_jps,
+    "BIDIRECTIONAL_BFS": solve_bidirectional_bfs,
+    "BIDIRECTIONAL_A*": solve_bidirectional_astar,
+    "D*_LITE": solve_dstar_lite,
+    "HPA*": solve_hpa,
+    "MDP_POLICY": solve_mdp_policy_iteration,
+    "MDP_VALUE": solve_mdp_value_iteration,
+}
+
+# Solvers that take discount and theta.
+mdp_algorithms = ("MDP_POLICY", "MDP_VALUE")
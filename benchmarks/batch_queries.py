@@ -0,0 +1,49 @@
+import argparse
+import contextlib
+import io
+import random
+import time
+from alogrithms.astar_solver import solve_astar
+from alogrithms.batch_solver import solve_batch
+from alogrithms.bfs_solver import solve_bfs
+from maze_generator.cache import load_maze
+from maze_generator.graph import MazeGraph
+
+# Queries per second: one goal, many random starts, batch field walk vs one solve per query.
+# Run from the repository root: python -m benchmarks.batch_queries --dim 100 --queries 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch multi-query throughput.")
+    parser.add_argument("--dim", type=int, default=100)
+    parser.add_argument("--difficulty", type=int, default=6)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, help="Load the maze from the on-disk cache for this seed.")
+    parser.add_argument("--loop-queries", type=int, default=100,
+                        help="Queries timed for the per-query loop (it is much slower).")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = load_maze(difficulty=args.difficulty, dim=args.dim, seed=args.seed)
+    graph = MazeGraph(maze)
+    goal = (maze.shape[0] - 2, maze.shape[1] - 1)
+    rnd = random.Random(args.seed)
+    starts = [graph.cell(rnd.randrange(graph.num_nodes)) for _ in range(args.queries)]
+
+    stats = {}
+    begin = time.perf_counter()
+    batch_steps = [steps for _, steps, _ in solve_batch(graph, starts, goal, stats=stats)]
+    batch_time = time.perf_counter() - begin
+    print(f"{'Batch':>8}: {args.queries / batch_time:>10.1f} queries/sec "
+          f"({stats['setup_time']:.4f} sec setup, {batch_time:.4f} sec total)")
+
+    for algorithm, solve_func in (("BFS", solve_bfs), ("A*", solve_astar)):
+        loop_starts = starts[:args.loop_queries]
+        begin = time.perf_counter()
+        loop_steps = [solve_func(graph, start, goal)[1] for start in loop_starts]
+        loop_time = time.perf_counter() - begin
+        assert loop_steps == batch_steps[:len(loop_steps)], "batch paths must be shortest paths"
+        print(f"{algorithm:>8}: {len(loop_starts) / loop_time:>10.1f} queries/sec "
+              f"({loop_time:.4f} sec for {len(loop_starts)} queries)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import random
+import tempfile
+import time
+import numpy as np
+from alogrithms.bfs_solver import solve_bfs
+from alogrithms.hpa_solver import load_hpa
+from maze_generator import maze_generator
+from maze_generator.graph import MazeGraph
+
+# HPA* on a large open maze (a Wilson's spanning tree with extra openings, so there are
+# many paths and the entrance choice matters): abstract graph build time vs loading it
+# from the cache, per-query latency for random pairs and for pairs close together, and
+# the suboptimality gap of the random pairs against the BFS shortest path. --landmarks 0
+# falls back to the Manhattan heuristic alone.
+# Run from the repository root: python -m benchmarks.hpa --dim 1000   (a 2001x2001 grid)
+
+def percentiles(values):
+    p50, p90, p99 = np.percentile(values, [50, 90, 99]) * 1e3
+    return f"median {p50:8.3f} ms, p90 {p90:8.3f} ms, p99 {p99:8.3f} ms"
+
+def main():
+    parser = argparse.ArgumentParser(description="HPA* preprocessing, query latency and path quality.")
+    parser.add_argument("--dim", type=int, default=1000)
+    parser.add_argument("--complexity", type=int, help="Extra openings (default: dim * dim / 4).")
+    parser.add_argument("--cluster-size", type=int, default=16)
+    parser.add_argument("--landmarks", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--radius", type=int, default=32, help="Largest row/column offset of the close pairs.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    complexity = args.complexity if args.complexity is not None else args.dim * args.dim // 4
+    maze = np.asarray(maze_generator.create_maze_wilson(args.dim, args.dim, complexity=complexity, seed=args.seed),
+                      dtype=np.uint8)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        begin = time.perf_counter()
+        planner = load_hpa(maze, args.cluster_size, cache_dir, args.landmarks)
+        build = time.perf_counter() - begin
+        begin = time.perf_counter()
+        planner = load_hpa(maze, args.cluster_size, cache_dir, args.landmarks)
+        load = time.perf_counter() - begin
+    print(f"{maze.shape[0]}x{maze.shape[1]} maze, clusters of {args.cluster_size}: {planner.num_nodes} abstract nodes, "
+          f"{len(planner.indices)} edges, {args.landmarks} landmarks")
+    print(f"Preprocessing {build:.2f} sec, loading it from the cache {load:.2f} sec")
+
+    rnd = random.Random(args.seed)
+    open_cells = np.argwhere(maze == 0)
+    graph = MazeGraph(maze)
+    latency, gaps, expanded = [], [], []
+    for _ in range(args.queries):
+        start, goal = (tuple(int(x) for x in open_cells[rnd.randrange(len(open_cells))]) for _ in range(2))
+        stats = {}
+        begin = time.perf_counter()
+        path, steps, _ = planner.query(start, goal, stats=stats)
+        latency.append(time.perf_counter() - begin)
+        expanded.append(stats["expanded"])
+        _, bfs_steps, _ = solve_bfs(graph, start, goal)
+        if path is None or path[-1] != goal or steps < bfs_steps:
+            raise AssertionError(f"Bad HPA* path from {start} to {goal}")
+        gaps.append(steps / bfs_steps - 1)
+
+    close = []
+    while len(close) < args.queries:
+        r, c = open_cells[rnd.randrange(len(open_cells))]
+        goal = (r + rnd.randint(-args.radius, args.radius), c + rnd.randint(-args.radius, args.radius))
+        if 0 <= goal[0] < maze.shape[0] and 0 <= goal[1] < maze.shape[1] and maze[goal] == 0:
+            begin = time.perf_counter()
+            planner.query((r, c), goal)
+            close.append(time.perf_counter() - begin)
+
+    gaps = np.array(gaps)
+    print(f"{'Random pairs':>22}: {percentiles(latency)}, {np.median(expanded):.0f} abstract nodes expanded (median)")
+    print(f"{f'Pairs within {args.radius}':>22}: {percentiles(close)}")
+    print(f"{'Gap vs BFS':>22}: mean {gaps.mean() * 100:.2f}%, max {gaps.max() * 100:.2f}%, "
+          f"optimal in {np.mean(gaps == 0) * 100:.0f}% of {args.queries} queries")
+
+if __name__ == "__main__":
+    main()
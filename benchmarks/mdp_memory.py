@@ -0,0 +1,83 @@
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import tempfile
+import time
+import numpy as np
+from maze_generator.cache import load_maze
+
+# Peak RSS of the MDP solvers, each run in a fresh process (Linux: read from /proc).
+# Long runs are stopped after --time-limit seconds; the peak is reached in the first
+# iteration, so the reported high-water mark is still representative.
+# Run from the repository root: python -m benchmarks.mdp_memory --dim 2000
+
+def read_peak_kb(pid):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmHWM"):
+                return int(line.split()[1])
+    return 0
+
+def run_solver(maze_file, algorithm, dtype, mode, ready):
+    from alogrithms.mdp_policy_solver import solve_mdp_policy_iteration
+    from alogrithms.mdp_value_solver import solve_mdp_value_iteration
+    maze = np.load(maze_file)
+    start = (1, 0)
+    goal = (maze.shape[0] - 2, maze.shape[1] - 1)
+    ready.put(read_peak_kb(os.getpid()))
+    with contextlib.redirect_stdout(io.StringIO()):
+        if algorithm == "MDP_POLICY":
+            solve_mdp_policy_iteration(maze, start, goal, evaluation=mode or "exact", dtype=dtype)
+        else:
+            solve_mdp_value_iteration(maze, start, goal, mode=mode or "sync", dtype=dtype)
+
+def measure(maze_file, algorithm, dtype, mode, time_limit):
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Queue()
+    proc = ctx.Process(target=run_solver, args=(maze_file, algorithm, dtype, mode, ready))
+    proc.start()
+    base = ready.get()
+    peak = base
+    begin = time.time()
+    while proc.is_alive() and time.time() - begin < time_limit:
+        try:
+            peak = max(peak, read_peak_kb(proc.pid))
+        except FileNotFoundError:
+            break
+        time.sleep(0.05)
+    finished = not proc.is_alive()
+    proc.terminate()
+    proc.join()
+    return base, peak, finished
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of the MDP solvers.")
+    parser.add_argument("--dim", type=int, default=2000)
+    parser.add_argument("--difficulty", type=int, default=5)
+    parser.add_argument("--seed", type=int, help="Load the maze from the on-disk cache for this seed.")
+    parser.add_argument("--maze-file", help="Use a maze saved with np.save instead of generating one.")
+    parser.add_argument("--algorithms", nargs="+", default=["MDP_POLICY", "MDP_VALUE"])
+    parser.add_argument("--mode", help="evaluation= for MDP_POLICY / mode= for MDP_VALUE")
+    parser.add_argument("--time-limit", type=float, default=60.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        maze_file = args.maze_file
+        if maze_file is None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                maze = load_maze(difficulty=args.difficulty, dim=args.dim, seed=args.seed)
+            maze_file = os.path.join(tmp, "maze.npy")
+            np.save(maze_file, maze)
+            del maze
+
+        print(f"{'Algorithm':>11} {'dtype':>8} {'Maze RSS (MB)':>14} {'Peak RSS (MB)':>14} {'Solver (MB)':>12}  Finished")
+        for algorithm in args.algorithms:
+            for dtype in ("float64", "float32"):
+                base, peak, finished = measure(maze_file, algorithm, dtype, args.mode, args.time_limit)
+                print(f"{algorithm:>11} {dtype:>8} {base / 1024:>14.0f} {peak / 1024:>14.0f} "
+                      f"{(peak - base) / 1024:>12.0f}  {'yes' if finished else 'time limit'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import contextlib
+import io
+import os
+import time
+import numpy as np
+from alogrithms.mdp_value_solver import compile_mdp, value_iteration
+from maze_generator.cache import load_maze
+from maze_generator.graph import MazeGraph
+
+# Scaling of the row-band parallel value iteration: wall time per worker count, speedup
+# over one worker and parallel efficiency (speedup / workers), next to the single-threaded
+# "sync" sweeps. The MDP tables are compiled once and shared by every run.
+# Run from the repository root: python -m benchmarks.parallel_sweeps --dim 2000 --workers 1 2 4 8
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel Bellman sweep scaling.")
+    parser.add_argument("--dim", type=int, default=500)
+    parser.add_argument("--difficulty", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--discount", type=float, default=0.9)
+    parser.add_argument("--theta", type=float, default=0.001)
+    parser.add_argument("--dtype", choices=["float64", "float32"], default="float64")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = load_maze(difficulty=args.difficulty, dim=args.dim, seed=args.seed, fast=True)
+    graph = MazeGraph(maze)
+    goal_id = graph.node((maze.shape[0] - 2, maze.shape[1] - 1))
+    next_states, rewards = compile_mdp(graph, goal_id, dtype=np.dtype(args.dtype))
+    print(f"{maze.shape[0]}x{maze.shape[1]} maze, {graph.num_nodes} states, {os.cpu_count()} CPUs")
+
+    stats = {}
+    begin = time.perf_counter()
+    reference = value_iteration(next_states, rewards, goal_id, args.discount, args.theta, stats=stats)
+    sync_time = time.perf_counter() - begin
+    print(f"{'sync':>8}: {sync_time:8.3f} sec, {stats['sweeps']} sweeps")
+
+    print(f"{'Workers':>8} {'Time (sec)':>11} {'Speedup':>8} {'Efficiency':>11} {'vs sync':>8}")
+    base = None
+    for workers in args.workers:
+        begin = time.perf_counter()
+        V = value_iteration(next_states, rewards, goal_id, args.discount, args.theta, mode="parallel", workers=workers)
+        elapsed = time.perf_counter() - begin
+        assert np.array_equal(V, reference), "banded sweeps must match the sync sweeps"
+        base = base or elapsed
+        print(f"{workers:>8} {elapsed:>11.3f} {base / elapsed:>8.2f} {base / elapsed / workers:>11.0%} "
+              f"{sync_time / elapsed:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import contextlib
+import io
+import random
+import time
+import numpy as np
+from alogrithms.astar_solver import solve_astar
+from alogrithms.dstar_lite_solver import DStarLitePlanner
+from maze_generator.cache import load_maze
+from maze_generator.graph import MazeGraph
+
+# Replan latency after small maze edits: D* Lite repairing its previous search vs a full
+# re-solve with A* (graph rebuilt for the edited maze, as any from-scratch solver needs)
+# and a fresh D* Lite. Each round toggles a few random interior cells.
+# Run from the repository root: python -m benchmarks.replanning --dim 100 --rounds 50
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental replanning latency.")
+    parser.add_argument("--dim", type=int, default=100)
+    parser.add_argument("--difficulty", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--cells-per-round", type=int, default=2)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = np.array(load_maze(difficulty=args.difficulty, dim=args.dim, seed=args.seed), dtype=np.uint8)
+    start, goal = (1, 0), (maze.shape[0] - 2, maze.shape[1] - 1)
+    rnd = random.Random(args.seed)
+
+    begin = time.perf_counter()
+    planner = DStarLitePlanner(maze, start, goal)
+    planner.replan()
+    print(f"Initial D* Lite plan: {time.perf_counter() - begin:.4f} sec")
+
+    timings = {"D* Lite replan": [], "A* full re-solve": [], "D* Lite from scratch": []}
+    expanded = []
+    for _ in range(args.rounds):
+        changes = []
+        for _ in range(args.cells_per_round):
+            cell = (rnd.randint(1, maze.shape[0] - 2), rnd.randint(1, maze.shape[1] - 2))
+            maze[cell] = 1 - maze[cell]
+            changes.append((cell, int(maze[cell])))
+
+        stats = {}
+        begin = time.perf_counter()
+        planner.update_cells(changes)
+        path, steps, _ = planner.replan(stats=stats)
+        timings["D* Lite replan"].append(time.perf_counter() - begin)
+        expanded.append(stats["expanded"])
+
+        begin = time.perf_counter()
+        _, astar_steps, _ = solve_astar(MazeGraph(maze), start, goal)
+        timings["A* full re-solve"].append(time.perf_counter() - begin)
+
+        begin = time.perf_counter()
+        fresh = DStarLitePlanner(maze, start, goal)
+        fresh.replan()
+        timings["D* Lite from scratch"].append(time.perf_counter() - begin)
+        if steps != astar_steps:
+            raise AssertionError(f"Replanned path length {steps} != A* {astar_steps}")
+
+    print(f"{args.rounds} rounds of {args.cells_per_round} toggled cells on a {maze.shape[0]}x{maze.shape[1]} maze")
+    for name, values in timings.items():
+        print(f"{name:>22}: median {np.median(values) * 1e3:9.3f} ms, max {np.max(values) * 1e3:9.3f} ms")
+    print(f"{'Cells re-expanded':>22}: median {np.median(expanded):9.0f}, max {np.max(expanded):9.0f}")
+
+if __name__ == "__main__":
+    main()
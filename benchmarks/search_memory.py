@@ -0,0 +1,46 @@
+import argparse
+import contextlib
+import io
+import time
+import tracemalloc
+from alogrithms.dfs_solver import solve_dfs
+from alogrithms.bfs_solver import solve_bfs
+from alogrithms.astar_solver import solve_astar
+from maze_generator.cache import load_maze
+
+# Peak memory of the search solvers, measured with tracemalloc.
+# Run from the repository root: python -m benchmarks.search_memory
+solvers = {
+    "DFS": solve_dfs,
+    "BFS": solve_bfs,
+    "A*": solve_astar,
+}
+
+def measure_peak(solve_func, maze, start, goal):
+    tracemalloc.start()
+    path, steps, runtime = solve_func(maze, start, goal)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return steps, runtime, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of DFS/BFS/A* per maze size.")
+    parser.add_argument("--dims", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--difficulty", type=int, default=3)
+    parser.add_argument("--seed", type=int, help="Load the maze from the on-disk cache for this seed.")
+    args = parser.parse_args()
+
+    print(f"{'Dim':>6} {'Algorithm':>10} {'Path Length':>12} {'Runtime (sec)':>14} {'Peak (kB)':>12}")
+    for dim in args.dims:
+        gen_start = time.time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            maze = load_maze(difficulty=args.difficulty, dim=dim, seed=args.seed)
+        print(f"# {dim}x{dim} maze generated in {time.time() - gen_start:.1f} sec")
+        start = (1, 0)
+        goal = (maze.shape[0] - 2, maze.shape[1] - 1)
+        for algorithm, solve_func in solvers.items():
+            steps, runtime, peak = measure_peak(solve_func, maze, start, goal)
+            print(f"{dim:>6} {algorithm:>10} {steps:>12} {runtime:>14.4f} {peak // 1024:>12}")
+
+if __name__ == "__main__":
+    main()
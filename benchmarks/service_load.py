@@ -0,0 +1,122 @@
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from solve_service import ServiceClient, latency_summary
+
+# Load generator for the solve service: publishes one seeded maze, then sends --requests
+# solve requests from --concurrency keep-alive connections. Goals and starts are drawn
+# from small pools of cell centres (always open in the generated mazes), so --goals
+# controls how many requests can be coalesced. Prints client-side latency percentiles,
+# throughput and the server's own counters. --spawn starts a service for the run.
+#   python -m benchmarks.service_load --spawn --workers 4 --dim 100 --requests 2000 --concurrency 32
+
+def percentile_line(name, summary):
+    if not summary["count"]:
+        return f"{name:>18}: no requests"
+    return (f"{name:>18}: {summary['count']:>6} requests, p50 {summary['p50']:8.2f} ms, p90 {summary['p90']:8.2f} ms, "
+            f"p99 {summary['p99']:8.2f} ms, max {summary['max']:8.2f} ms")
+
+async def wait_for_service(client, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            return await client.call("GET", "/stats")
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+async def run(args):
+    client = ServiceClient(args.host, args.port, args.unix)
+    await wait_for_service(client)
+    status, maze = await client.call("POST", "/mazes", {"difficulty": args.difficulty, "dim": args.dim,
+                                                        "seed": args.seed, "fast": args.fast})
+    if status != 200:
+        raise SystemExit(f"Could not create the maze: {maze['error']}")
+    rnd = random.Random(args.seed)
+    cell = lambda: [2 * rnd.randrange(args.dim) + 1, 2 * rnd.randrange(args.dim) + 1]
+    goals = [cell() for _ in range(args.goals)]
+    starts = [cell() for _ in range(args.starts)]
+    requests = [{"maze_id": maze["maze_id"], "algorithm": rnd.choice(args.algorithms),
+                 "start": rnd.choice(starts), "goal": rnd.choice(goals)} for _ in range(args.requests)]
+    for request in requests:
+        if request["algorithm"].startswith("MDP"):
+            request["params"] = {"discount": args.discount}
+
+    latencies, failures = defaultdict(list), []
+    queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    async def worker():
+        connection = ServiceClient(args.host, args.port, args.unix)
+        try:
+            while not queue.empty():
+                request = queue.get_nowait()
+                begin = time.perf_counter()
+                status, reply = await connection.call("POST", "/solve", request)
+                latencies[request["algorithm"]].append(time.perf_counter() - begin)
+                if status != 200:
+                    failures.append(reply["error"])
+        finally:
+            await connection.close()
+
+    begin = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - begin
+
+    print(f"{args.requests} requests on a {maze['shape'][0]}x{maze['shape'][1]} maze, {args.concurrency} connections, "
+          f"{args.goals} goals x {args.starts} starts: {elapsed:.2f} sec, {args.requests / elapsed:.1f} requests/sec")
+    print("Client latency:")
+    print(percentile_line("all", latency_summary([t for samples in latencies.values() for t in samples])))
+    for algorithm, samples in sorted(latencies.items()):
+        print(percentile_line(algorithm, latency_summary(samples)))
+    _, stats = await client.call("GET", "/stats")
+    print(f"Server: {stats['requests']} requests, {stats['coalesced']} coalesced, {stats['batches']} batches, "
+          f"{stats['solves']} solves, {stats['errors']} errors")
+    for name, summary in stats["latency_ms"].items():
+        print(percentile_line(f"server {name}", summary))
+    if failures:
+        print(f"{len(failures)} failed requests, e.g. {failures[0]}")
+    await client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the solve service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Connect to this Unix socket instead of TCP.")
+    parser.add_argument("--spawn", action="store_true", help="Start a service for this run and stop it afterwards.")
+    parser.add_argument("--workers", type=int, help="Solver processes of the spawned service.")
+    parser.add_argument("--dim", type=int, default=50)
+    parser.add_argument("--difficulty", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fast", action="store_true", help="Use the scalable maze generators.")
+    parser.add_argument("--algorithms", nargs="+", default=["BFS", "A*", "MDP_VALUE"])
+    parser.add_argument("--discount", type=float, default=0.99)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--goals", type=int, default=4)
+    parser.add_argument("--starts", type=int, default=50)
+    args = parser.parse_args()
+
+    service = None
+    if args.spawn:
+        command = [sys.executable, "solve_service.py"]
+        command += ["--unix", args.unix] if args.unix else ["--host", args.host, "--port", str(args.port)]
+        if args.workers:
+            command += ["--workers", str(args.workers)]
+        service = subprocess.Popen(command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        asyncio.run(run(args))
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
+
+if __name__ == "__main__":
+    main()
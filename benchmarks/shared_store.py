@@ -0,0 +1,101 @@
+import argparse
+import contextlib
+import io
+import multiprocessing
+import time
+import numpy as np
+from alogrithms.solvers import solve_functions
+from maze_generator.cache import load_maze
+from maze_generator.graph import MazeGraph
+from maze_generator.shared_store import SharedMazeStore, attach_graph, attach_maze
+
+# Memory of N worker processes that all work on one large maze, with the maze passed to
+# each worker as a pickled array ("copy") vs attached from a SharedMazeStore ("store").
+# Every worker reads the whole maze (and graph, with --graph), optionally runs a solver,
+# and reports its RSS and PSS while all workers are alive. PSS splits each shared page
+# between the processes mapping it, so the PSS total is the memory actually used. A first
+# run of idle workers gives the interpreter and import baseline, which is subtracted.
+# Run from the repository root: python -m benchmarks.shared_store --dim 4000 --workers 8
+
+def _memory_kb():
+    # (rss, pss) of this process in kB, from /proc/self/smaps_rollup (Linux).
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss"):
+                values[name] = int(rest.split()[0])
+    return values["Rss"], values["Pss"]
+
+def _worker(source, mode, with_graph, algorithm, barrier, results):
+    if mode == "baseline":
+        barrier.wait()
+        results.put(_memory_kb())
+        barrier.wait()
+        return
+    if mode == "store":
+        graph = attach_graph(source) if with_graph else None
+        maze = graph.maze if with_graph else attach_maze(source)
+    else:
+        maze = source
+        graph = MazeGraph(maze) if with_graph else None
+    # Touch every page a solver would read.
+    for r in range(0, maze.shape[0], 64):
+        np.count_nonzero(maze[r:r + 64] == 0)
+    if with_graph:
+        for field in ("coords", "cell_ids", "adjacency", "indptr", "indices"):
+            array = getattr(graph, field).reshape(-1)
+            for i in range(0, len(array), 1 << 20):
+                array[i:i + (1 << 20)].max()
+    if algorithm:
+        with contextlib.redirect_stdout(io.StringIO()):
+            solve_functions[algorithm](graph if with_graph else maze, (1, 0), (maze.shape[0] - 2, maze.shape[1] - 1))
+    barrier.wait()
+    results.put(_memory_kb())
+    barrier.wait()
+
+def measure(mode, maze, handle, args, baseline=None):
+    # Spawned workers, so the "copy" mode pays the pickled transfer a pool task would.
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(args.workers)
+    results = context.Queue()
+    source = {"copy": maze, "store": handle}.get(mode)
+    begin = time.perf_counter()
+    workers = [context.Process(target=_worker, args=(source, mode, args.graph, args.algorithm, barrier, results))
+               for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    memory = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - begin
+    rss = sum(m[0] for m in memory) / 1024
+    pss = sum(m[1] for m in memory) / 1024
+    above = f", {pss - baseline:9.1f} MB PSS above baseline" if baseline is not None else ""
+    print(f"{mode:>8}: total RSS {rss:9.1f} MB, total PSS {pss:9.1f} MB{above}, {elapsed:.1f} sec")
+    return pss
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker memory with and without the shared maze store.")
+    parser.add_argument("--dim", type=int, default=4000)
+    parser.add_argument("--difficulty", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--graph", action="store_true", help="Also share (or build) the MazeGraph.")
+    parser.add_argument("--algorithm", choices=list(solve_functions), help="Also run this solver in every worker.")
+    parser.add_argument("--modes", nargs="+", choices=["copy", "store"], default=["copy", "store"])
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = np.asarray(load_maze(difficulty=args.difficulty, dim=args.dim, seed=args.seed, fast=True), dtype=np.uint8)
+    with SharedMazeStore() as store:
+        handle = store.publish("maze", maze, graph=args.graph)
+        shared_mb = sum(path.stat().st_size for path in store.directory.iterdir()) / 2 ** 20
+        print(f"{maze.shape[0]}x{maze.shape[1]} maze: {maze.nbytes / 2 ** 20:.1f} MB, {shared_mb:.1f} MB published "
+              f"{'with' if args.graph else 'without'} its graph, {args.workers} workers")
+        baseline = measure("baseline", maze, None, args)
+        for mode in args.modes:
+            measure(mode, maze, handle, args, baseline)
+
+if __name__ == "__main__":
+    main()
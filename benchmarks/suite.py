@@ -0,0 +1,165 @@
+import argparse
+import contextlib
+import datetime
+import gc
+import io
+import json
+import math
+import platform
+import sys
+import time
+import numpy as np
+from alogrithms.solvers import mdp_algorithms, solve_functions
+from maze_generator import maze_generator
+from maze_generator.cache import cached_maze
+from maze_generator.graph import MazeGraph
+
+# Microbenchmarks for every solver and every maze generator on fixed-seed mazes.
+# Each case gets warm-up runs and then repeated trials. A trial repeats the operation
+# until it lasts at least --min-trial-time, so sub-millisecond solves are not dominated
+# by timer resolution. The report gives the median time per operation with a
+# distribution-free 95% confidence interval, plus throughput.
+#
+# Save a baseline, then compare later runs against it:
+#   python -m benchmarks.suite --save baseline.json
+#   python -m benchmarks.suite --compare baseline.json --threshold 0.10
+# A case is flagged as a regression when its median is more than --threshold slower than
+# the baseline and the two confidence intervals do not overlap. Compare mode exits with
+# status 1 when anything regressed.
+
+generators = {
+    "dfs": lambda dim, seed: maze_generator.create_maze_dfs(dim, seed=seed),
+    "prims": lambda dim, seed: maze_generator.create_maze_prims(dim, extra_openings=4, seed=seed),
+    "aldous_broder": lambda dim, seed: maze_generator.create_maze_aldous_broder(dim, dim, complexity=20, seed=seed),
+    "prims_fast": lambda dim, seed: maze_generator.create_maze_prims_fast(dim, extra_openings=4, seed=seed),
+    "wilson": lambda dim, seed: maze_generator.create_maze_wilson(dim, dim, complexity=20, seed=seed),
+    "binary_tree": lambda dim, seed: maze_generator.create_maze_binary_tree(dim, seed=seed),
+    "sidewinder": lambda dim, seed: maze_generator.create_maze_sidewinder(dim, seed=seed),
+}
+
+def median_confidence_interval(samples, z=1.96):
+    # Order-statistic interval for the median: ranks n/2 -/+ z*sqrt(n)/2 of the sorted samples.
+    samples = sorted(samples)
+    n = len(samples)
+    half_width = z * math.sqrt(n) / 2
+    low = max(int(math.floor(n / 2 - half_width)), 0)
+    high = min(int(math.ceil(n / 2 + half_width)), n - 1)
+    return samples[low], samples[high]
+
+def time_case(operation, warmup, trials, min_trial_time):
+    for _ in range(warmup):
+        operation()
+    # Calibrate how many operations one trial needs to last at least min_trial_time.
+    loops = 1
+    while True:
+        begin = time.perf_counter_ns()
+        for _ in range(loops):
+            operation()
+        elapsed = (time.perf_counter_ns() - begin) / 1e9
+        if elapsed >= min_trial_time or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(math.ceil(min_trial_time / elapsed))))
+
+    per_op = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(trials):
+            begin = time.perf_counter_ns()
+            for _ in range(loops):
+                operation()
+            per_op.append((time.perf_counter_ns() - begin) / 1e9 / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    median = float(np.median(per_op))
+    ci_low, ci_high = median_confidence_interval(per_op)
+    return {"median_s": median, "ci_low_s": ci_low, "ci_high_s": ci_high, "trials": trials, "loops": loops,
+            "ops_per_sec": 1 / median if median > 0 else float("inf")}
+
+def build_cases(args):
+    # (name, operation, cells) per case; cells turns the median into a cells/sec throughput.
+    cases = []
+    for dim in args.dims:
+        for name, generate in generators.items():
+            if name == "aldous_broder" and dim > args.max_aldous_broder_dim:
+                continue
+            cases.append((f"generate/{name}/dim={dim}",
+                          lambda generate=generate, dim=dim: generate(dim, args.seed), (2 * dim + 1) ** 2))
+        for difficulty in args.difficulties:
+            with contextlib.redirect_stdout(io.StringIO()):
+                maze = cached_maze(difficulty, dim, args.seed)
+            graph = MazeGraph(maze)
+            start, goal = (1, 0), (maze.shape[0] - 2, maze.shape[1] - 1)
+            for algorithm, solve_func in solve_functions.items():
+                if algorithm in mdp_algorithms and dim > args.max_mdp_dim:
+                    continue
+                params = {"discount": 0.99} if algorithm in mdp_algorithms else {}
+                if algorithm == "MDP_POLICY":
+                    params["seed"] = args.seed
+                cases.append((f"solve/{algorithm}/dim={dim}/difficulty={difficulty}",
+                              lambda solve_func=solve_func, graph=graph, start=start, goal=goal, params=params:
+                              solve_func(graph, start, goal, **params), graph.num_nodes))
+    if args.only:
+        cases = [case for case in cases if any(pattern in case[0] for pattern in args.only)]
+    return cases
+
+def compare(results, baseline, threshold):
+    regressions = 0
+    print(f"\n{'Case':<48} {'Baseline (ms)':>14} {'Current (ms)':>13} {'Change':>8}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<48} {'-':>14} {current['median_s'] * 1e3:>13.4f} {'new':>8}")
+            continue
+        change = current["median_s"] / base["median_s"] - 1
+        regressed = change > threshold and current["ci_low_s"] > base["ci_high_s"]
+        improved = change < -threshold and current["ci_high_s"] < base["ci_low_s"]
+        regressions += regressed
+        flag = "  REGRESSION" if regressed else "  faster" if improved else ""
+        print(f"{name:<48} {base['median_s'] * 1e3:>14.4f} {current['median_s'] * 1e3:>13.4f} {change:>+8.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Solver and generator microbenchmarks with baselines.")
+    parser.add_argument("--dims", type=int, nargs="+", default=[10, 30, 60])
+    parser.add_argument("--difficulties", type=int, nargs="+", default=[3, 6, 10])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--trials", type=int, default=15)
+    parser.add_argument("--min-trial-time", type=float, default=0.02)
+    parser.add_argument("--max-mdp-dim", type=int, default=60)
+    parser.add_argument("--max-aldous-broder-dim", type=int, default=60)
+    parser.add_argument("--only", nargs="+", help="Run only cases whose name contains one of these strings.")
+    parser.add_argument("--save", help="Write the results as a JSON baseline.")
+    parser.add_argument("--compare", help="Compare against a JSON baseline.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown flagged as a regression.")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'Case':<48} {'Median (ms)':>12} {'95% CI (ms)':>21} {'ops/sec':>10} {'cells/sec':>12}")
+    for name, operation, cells in build_cases(args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = time_case(operation, args.warmup, args.trials, args.min_trial_time)
+        result["cells_per_sec"] = cells * result["ops_per_sec"]
+        results[name] = result
+        print(f"{name:<48} {result['median_s'] * 1e3:>12.4f} "
+              f"{result['ci_low_s'] * 1e3:>10.4f}-{result['ci_high_s'] * 1e3:<10.4f} "
+              f"{result['ops_per_sec']:>10.1f} {result['cells_per_sec']:>12.0f}")
+
+    if args.save:
+        meta = {"date": datetime.datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+                "numpy": np.__version__, "platform": platform.platform(), "seed": args.seed}
+        with open(args.save, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"Baseline saved to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}.")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
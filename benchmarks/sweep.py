@@ -0,0 +1,150 @@
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from alogrithms.instrumentation import instrumented_solve
+from alogrithms.solvers import mdp_algorithms, solve_functions
+from maze_generator.cache import cached_maze
+from maze_generator.render import render_solution
+from maze_generator.shared_store import SharedMazeStore, attach_graph, publish_maze
+
+# Non-interactive benchmark sweep over a grid of (dim, difficulty, seed, algorithm,
+# discount, theta, repeat). Each run is one task on a process pool, and each result is
+# appended to the CSV as soon as it finishes. Rerunning the same command skips the runs
+# already in the file, so a crashed or interrupted sweep resumes where it stopped. Each
+# maze is generated once and published with its graph to a SharedMazeStore; the runs
+# memory-map it read-only, so the workers share one copy instead of one each.
+# Run from the repository root:
+#   python -m benchmarks.sweep --dims 10 30 100 --difficulties 3 6 10 --output sweep.csv
+
+# Fast records which generators built the mazes (--fast), so a resumed sweep never mixes them.
+key_fields = ["Dim", "Difficulty", "Seed", "Fast", "Algorithm", "Discount", "Theta", "Repeat"]
+# Solver counters written per run; solvers that do not report one get "N/A".
+metric_fields = {"Nodes Expanded": "expanded", "Frontier Max": "frontier_max", "Heap Pushes": "heap_pushes",
+                 "Heap Pops": "heap_pops", "Sweeps": "sweeps"}
+fieldnames = key_fields + ["Path Length", "Runtime (sec)", "CPU Time (sec)", "Peak Memory (kB)",
+                           *metric_fields, "Status"]
+
+def build_jobs(args):
+    jobs = []
+    for dim, difficulty, seed, algorithm in itertools.product(args.dims, args.difficulties, args.seeds,
+                                                               args.algorithms):
+        # Discount and theta only multiply the grid for the MDP solvers.
+        if algorithm in mdp_algorithms:
+            params = itertools.product(args.discounts, args.thetas)
+        else:
+            params = [("N/A", "N/A")]
+        for (discount, theta), repeat in itertools.product(params, range(args.repeats)):
+            jobs.append({"Dim": dim, "Difficulty": difficulty, "Seed": seed, "Fast": args.fast,
+                         "Algorithm": algorithm, "Discount": discount, "Theta": theta, "Repeat": repeat})
+    return jobs
+
+def job_key(row):
+    return tuple(str(row[field]) for field in key_fields)
+
+def read_completed(output):
+    # Keys of the runs already recorded with a result. Runs that ended in an error are
+    # not counted, so they are retried (their error rows stay in the file). A line cut
+    # short by a crash is dropped from the file so that appending continues on a clean line.
+    if not os.path.exists(output):
+        return set()
+    with open(output, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+    with open(output, newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames and reader.fieldnames != fieldnames:
+            raise SystemExit(f"{output} was written with different columns; use a new --output file.")
+        return {job_key(row) for row in reader if row.get("Status") in ("ok", "no path")}
+
+def warm_maze(dim, difficulty, seed, fast, store_dir):
+    # Generates the maze (through the on-disk cache) and publishes it with its graph, once,
+    # before the runs that share it start. Returns the store handle.
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = cached_maze(difficulty, dim, seed, fast=fast)
+    return publish_maze(store_dir, f"dim={dim}-difficulty={difficulty}-seed={seed}", maze)
+
+def run_job(job, handle, render_dir=None):
+    row = dict(job)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            graph = attach_graph(handle)
+            maze = graph.maze
+            start, goal = (1, 0), (maze.shape[0] - 2, maze.shape[1] - 1)
+            params = {}
+            if job["Algorithm"] in mdp_algorithms:
+                params = {"discount": job["Discount"], "theta": job["Theta"]}
+            if job["Algorithm"] == "MDP_POLICY":
+                params["seed"] = job["Seed"]
+            path, steps, _, metrics = instrumented_solve(solve_functions[job["Algorithm"]], graph, start, goal,
+                                                         **params)
+        row.update({"Path Length": steps, "Runtime (sec)": metrics["wall_ns"] / 1e9,
+                    "CPU Time (sec)": metrics["cpu_ns"] / 1e9,
+                    "Peak Memory (kB)": metrics["peak_memory_kb"] if metrics["peak_memory_kb"] is not None else "N/A",
+                    "Status": "ok" if path and tuple(path[-1]) == goal else "no path"})
+        row.update({field: metrics.get(key, "N/A") for field, key in metric_fields.items()})
+        if render_dir:
+            # After the measurement, so the image never counts towards the solve.
+            name = "_".join(f"{field}={job[field]}" for field in key_fields).replace("*", "star")
+            render_solution(maze, path, os.path.join(render_dir, f"{name}.png"))
+    except Exception as e:
+        row.update({field: "N/A" for field in fieldnames if field not in row})
+        row.update({"Path Length": 0, "Runtime (sec)": 0, "Status": f"error: {type(e).__name__}: {e}"})
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel benchmark sweep over mazes and solvers.")
+    parser.add_argument("--dims", type=int, nargs="+", default=[10, 30, 60, 100])
+    parser.add_argument("--difficulties", type=int, nargs="+", default=[3, 6, 10])
+    parser.add_argument("--algorithms", nargs="+", default=list(solve_functions), choices=list(solve_functions))
+    parser.add_argument("--discounts", type=float, nargs="+", default=[0.9])
+    parser.add_argument("--thetas", type=float, nargs="+", default=[0.001])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--fast", action="store_true", help="Use the scalable maze generators.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", default="sweep_results.csv")
+    parser.add_argument("--render-dir", help="Also write a solution image per run into this directory.")
+    args = parser.parse_args()
+
+    jobs = build_jobs(args)
+    completed = read_completed(args.output)
+    pending = [job for job in jobs if job_key(job) not in completed]
+    print(f"{len(jobs)} runs in the sweep, {len(jobs) - len(pending)} already in {args.output}, "
+          f"{len(pending)} to go on {args.workers} workers.")
+    if not pending:
+        return
+
+    if args.render_dir:
+        os.makedirs(args.render_dir, exist_ok=True)
+    begin = time.perf_counter()
+    write_header = not os.path.exists(args.output) or os.path.getsize(args.output) == 0
+    with open(args.output, "a", newline="") as csvfile, SharedMazeStore() as store, \
+            ProcessPoolExecutor(max_workers=args.workers) as pool:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        if write_header:
+            writer.writeheader()
+            csvfile.flush()
+        mazes = {(job["Dim"], job["Difficulty"], job["Seed"]) for job in pending}
+        warming = {pool.submit(warm_maze, *maze, args.fast, store.directory): maze for maze in mazes}
+        handles = {warming[future]: future.result() for future in as_completed(warming)}
+
+        # Biggest mazes first, so the long runs do not end up alone at the tail of the sweep.
+        pending.sort(key=lambda job: job["Dim"], reverse=True)
+        futures = [pool.submit(run_job, job, handles[job["Dim"], job["Difficulty"], job["Seed"]], args.render_dir)
+                   for job in pending]
+        for done, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            writer.writerow(row)
+            csvfile.flush()
+            print(f"[{done}/{len(pending)}] {row['Algorithm']} dim={row['Dim']} difficulty={row['Difficulty']} "
+                  f"seed={row['Seed']}: {row['Status']}, {row['Runtime (sec)']:.4f} sec")
+    print(f"Sweep finished in {time.perf_counter() - begin:.1f} sec, results in {args.output}")
+
+if __name__ == "__main__":
+    main()
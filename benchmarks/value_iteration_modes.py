@@ -0,0 +1,40 @@
+import argparse
+import contextlib
+import io
+import time
+from alogrithms.bfs_solver import solve_bfs
+from alogrithms.mdp_value_solver import solve_mdp_value_iteration
+from maze_generator.cache import load_maze
+from maze_generator.graph import MazeGraph
+
+# Bellman backups and wall time of the value iteration modes at each difficulty level.
+# Run from the repository root: python -m benchmarks.value_iteration_modes
+modes = ["sync", "gauss_seidel", "prioritized"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare value iteration modes per difficulty.")
+    parser.add_argument("--dim", type=int, default=60)
+    parser.add_argument("--difficulties", type=int, nargs="+", default=list(range(1, 11)))
+    parser.add_argument("--discount", type=float, default=0.99)
+    parser.add_argument("--theta", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, help="Load the maze from the on-disk cache for this seed.")
+    args = parser.parse_args()
+
+    print(f"{'Difficulty':>10} {'Mode':>13} {'Sweeps':>7} {'Backups':>10} {'Runtime (sec)':>14} {'Path Length':>12} {'BFS Length':>11}")
+    for difficulty in args.difficulties:
+        with contextlib.redirect_stdout(io.StringIO()):
+            maze = load_maze(difficulty=difficulty, dim=args.dim, seed=args.seed)
+        graph = MazeGraph(maze)
+        start = (1, 0)
+        goal = (maze.shape[0] - 2, maze.shape[1] - 1)
+        _, bfs_steps, _ = solve_bfs(graph, start, goal)
+        for mode in modes:
+            stats = {}
+            begin = time.perf_counter()
+            _, steps, _ = solve_mdp_value_iteration(graph, start, goal, discount=args.discount,
+                                                    theta=args.theta, mode=mode, stats=stats)
+            runtime = time.perf_counter() - begin
+            print(f"{difficulty:>10} {mode:>13} {stats['sweeps']:>7} {stats['backups']:>10} {runtime:>14.4f} {steps:>12} {bfs_steps:>11}")
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,16 @@
-import os
+import argparse
 import csv
 import datetime
-import numpy as np
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 from pathlib import Path
-from alogrithms.dfs_solver import solve_dfs
-from alogrithms.bfs_solver import solve_bfs
-from alogrithms.astar_solver import solve_astar
-from alogrithms.mdp_policy_solver import solve_mdp_policy_iteration
-from alogrithms.mdp_value_solver import solve_mdp_value_iteration
+from alogrithms.instrumentation import instrumented_solve
+from alogrithms.solvers import solve_functions
 from maze_generator.maze_generator import generate_maze
+from maze_generator.graph import MazeGraph
+from maze_generator.maze import Maze
+from maze_generator.render import RenderPool
 
 
 def create_results_directory():
@@ -18,25 +19,13 @@ def create_results_directory():
     results_dir.mkdir(parents=True, exist_ok=True)
     return results_dir
 
-def save_maze_solution(maze, path, algorithm, results_dir):
-    plt.figure(figsize=(10, 10))
-    plt.imshow(maze, cmap="gray_r")
-
-    if path:
-        path_x, path_y = zip(*path)
-        plt.plot(path_y, path_x, marker="o", color="red", markersize=4, linewidth=2, label=algorithm)
-
-    plt.title(f"Solution using {algorithm}")
-    plt.legend()
-    plt.axis("off")
-    
-    image_path = results_dir / f"{algorithm}_solution.png"
-    plt.savefig(image_path)
-    plt.close()
+def solution_image_path(algorithm, results_dir):
+    return results_dir / f"{algorithm}_solution.png"
 
 def save_results_to_csv(results, results_dir):
     csv_filename = results_dir / "algorithm_performance.csv"
-    fieldnames = ["Algorithm", "Path Length", "Runtime (sec)", "Memory (kB)", "Discount", "Theta"]
+    fieldnames = ["Algorithm", "Path Length", "Runtime (sec)", "CPU Time (sec)", "Memory (kB)", "Nodes Expanded",
+                  "Frontier Max", "Heap Pushes", "Heap Pops", "Sweeps", "Discount", "Theta"]
     
     with open(csv_filename, "w", newline="") as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -46,7 +35,13 @@ def save_results_to_csv(results, results_dir):
                 "Algorithm": alg,
                 "Path Length": data["Path Length"],
                 "Runtime (sec)": data["Runtime"],
+                "CPU Time (sec)": data["CPU Time"],
                 "Memory (kB)": data["Memory"],
+                "Nodes Expanded": data.get("Nodes Expanded", "N/A"),
+                "Frontier Max": data.get("Frontier Max", "N/A"),
+                "Heap Pushes": data.get("Heap Pushes", "N/A"),
+                "Heap Pops": data.get("Heap Pops", "N/A"),
+                "Sweeps": data.get("Sweeps", "N/A"),
                 "Discount": data.get("Discount", "N/A"),
                 "Theta": data.get("Theta", "N/A"),
             })
@@ -72,7 +67,7 @@ def plot_performance_comparison(results, results_dir):
 
     plt.subplot(1, 3, 3)
     plt.bar(algorithms, memories, color="lightgreen")
-    plt.ylabel("Memory (kB)")
+    plt.ylabel("Peak Memory (kB)")
     plt.title("Algorithm Memory Usage Comparison")
 
     plt.suptitle("Maze Solver Performance Comparison")
@@ -82,61 +77,68 @@ def plot_performance_comparison(results, results_dir):
     print(f"Performance comparison graph saved at {performance_image_path}")
 
 
-def analyze_algorithms(maze, start, goal, algorithms, solve_functions, params):
+def analyze_algorithms(maze, start, goal, algorithms, solve_functions, params, render=True):
     results_dir = create_results_directory()
     results = {}
+    paths = {}
+    graph = MazeGraph(maze)
 
     for algorithm, solve_func in solve_functions.items():
         if algorithm in algorithms:
             print(f"Running {algorithm}...")
 
-            mem_before = os.popen("ps -o rss= -p " + str(os.getpid())).read().strip()
-            path, steps, runtime = solve_func(maze, start, goal, **params.get(algorithm, {}))
-            mem_after = os.popen("ps -o rss= -p " + str(os.getpid())).read().strip()
-            
-            mem_usage = int(mem_after) - int(mem_before)
+            path, steps, runtime, metrics = instrumented_solve(solve_func, graph, start, goal,
+                                                               **params.get(algorithm, {}))
             results[algorithm] = {
                 "Path Length": steps,
-                "Runtime": runtime,
-                "Memory": mem_usage,
+                "Runtime": metrics["wall_ns"] / 1e9,
+                "CPU Time": metrics["cpu_ns"] / 1e9,
+                "Memory": metrics["peak_memory_kb"] if metrics["peak_memory_kb"] is not None else 0,
+                "Nodes Expanded": metrics.get("expanded", "N/A"),
+                "Frontier Max": metrics.get("frontier_max", "N/A"),
+                "Heap Pushes": metrics.get("heap_pushes", "N/A"),
+                "Heap Pops": metrics.get("heap_pops", "N/A"),
+                "Sweeps": metrics.get("sweeps", "N/A"),
                 **params.get(algorithm, {}),
             }
 
-            save_maze_solution(maze, path, algorithm, results_dir)
+            paths[algorithm] = path
 
     save_results_to_csv(results, results_dir)
-    plot_performance_comparison(results, results_dir)
+    # Images are only rendered once every solver has finished, so no solve is timed
+    # while an image is being encoded.
+    if render:
+        with RenderPool() as renders:
+            for algorithm, path in paths.items():
+                renders.submit(maze, path, solution_image_path(algorithm, results_dir))
+        plot_performance_comparison(results, results_dir)
 
     return results
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate a maze and compare solvers on it.")
+    parser.add_argument("--no-render", action="store_true", help="Skip the solution images and the comparison chart.")
+    args = parser.parse_args()
+
     dim = int(input("Enter maze dimension (number of cells per side): "))
     difficulty = int(input("Enter maze difficulty (1-10): "))
 
-    maze = generate_maze(difficulty=difficulty, dim=dim)
+    maze = Maze(generate_maze(difficulty=difficulty, dim=dim))
     start = (1, 0)
     goal = (maze.shape[0]-2, maze.shape[1]-1)
 
     print("\nSelect algorithms to run (separate by commas):")
-    print("Options: DFS, BFS, A*, MDP_POLICY, MDP_VALUE")
+    print("Options: " + ", ".join(solve_functions))
     selected_algorithms = input("Enter choices: ").upper().split(",")
 
     selected_algorithms = [alg.strip() for alg in selected_algorithms]
-    valid_algorithms = {"DFS", "BFS", "A*", "MDP_POLICY", "MDP_VALUE"}
+    valid_algorithms = set(solve_functions)
     selected_algorithms = [alg for alg in selected_algorithms if alg in valid_algorithms]
 
     if not selected_algorithms:
         print("No valid algorithms selected. Exiting.")
         return
     
-    solve_functions = {
-        "DFS": solve_dfs,
-        "BFS": solve_bfs,
-        "A*": solve_astar,
-        "MDP_POLICY": solve_mdp_policy_iteration,
-        "MDP_VALUE": solve_mdp_value_iteration,
-    }
-
     mdp_params = {}
     if "MDP_POLICY" in selected_algorithms:
         mdp_params["MDP_POLICY"] = {
@@ -149,7 +151,7 @@ def main():
             "theta": float(input("Enter convergence threshold for MDP Value Iteration (e.g., 0.001): ")),
         }
 
-    analyze_algorithms(maze, start, goal, selected_algorithms, solve_functions, mdp_params)
+    analyze_algorithms(maze, start, goal, selected_algorithms, solve_functions, mdp_params, render=not args.no_render)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,51 @@
+import hashlib
+import os
+from pathlib import Path
+import numpy as np
+from maze_generator.maze_generator import generate_maze, maze_algorithm
+
+# On-disk cache of generated mazes. A maze is fully determined by its generator,
+# dimension, difficulty and seed, so those name the file and repeated runs load it
+# instead of regenerating. Bump CACHE_VERSION when a generator changes its output.
+DEFAULT_CACHE_DIR = Path(".maze_cache")
+CACHE_VERSION = 1
+
+def maze_cache_key(algorithm, dim, difficulty, seed):
+    text = f"v{CACHE_VERSION}|{algorithm}|{dim}|{difficulty}|{seed}"
+    return hashlib.sha256(text.encode()).hexdigest()[:24]
+
+def maze_cache_path(difficulty, dim, seed, fast=False, cache_dir=DEFAULT_CACHE_DIR, mmap=False):
+    algorithm = maze_algorithm(difficulty, fast)
+    key = maze_cache_key(algorithm, dim, difficulty, seed)
+    return Path(cache_dir) / f"{algorithm}-{key}{'.npy' if mmap else '.npz'}"
+
+def cached_maze(difficulty=5, dim=20, seed=0, fast=False, cache_dir=DEFAULT_CACHE_DIR, mmap=False):
+    # Returns the uint8 maze for these parameters, generating and storing it on a miss.
+    # Stored as a compressed .npz by default; mmap=True stores a plain .npy and returns it
+    # memory-mapped.
+    if seed is None:
+        raise ValueError("Only seeded mazes can be cached!")
+    path = maze_cache_path(difficulty, dim, seed, fast, cache_dir, mmap)
+    if not path.exists():
+        maze = np.asarray(generate_maze(difficulty, dim, fast=fast, seed=seed), dtype=np.uint8)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written under a temporary name and renamed, so concurrent runs never read a partial file.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            if mmap:
+                np.save(f, maze)
+            else:
+                np.savez_compressed(f, maze=maze)
+        os.replace(tmp_path, path)
+        if not mmap:
+            return maze
+    if mmap:
+        return np.load(path, mmap_mode="r")
+    with np.load(path) as data:
+        return data["maze"]
+
+def load_maze(difficulty=5, dim=20, seed=None, fast=False, cache_dir=DEFAULT_CACHE_DIR):
+    # Seeded mazes go through the cache, unseeded ones are generated fresh.
+    if seed is None:
+        return generate_maze(difficulty, dim, fast=fast)
+    return cached_maze(difficulty, dim, seed, fast=fast, cache_dir=cache_dir)
@@ -1,3 +1,4 @@
+import numpy as np
 import matplotlib.pyplot as plt
 
 def get_neighbors(cell, maze):
@@ -9,9 +10,44 @@ def get_neighbors(cell, maze):
             neighbors.append((nr, nc))
     return neighbors
 
+def path_to_root(parent, node):
+    ids = [node]
+    while parent[ids[-1]] != ids[-1]:
+        ids.append(int(parent[ids[-1]]))
+    return ids
+
+def reconstruct_path(parent, goal_id, coords):
+    ids = path_to_root(parent, goal_id)
+    ids.reverse()
+    return [tuple(cell) for cell in coords[ids].tolist()]
+
+def join_bidirectional_path(parent_forward, parent_backward, forward_id, backward_id, coords):
+    # forward_id lies in the search tree rooted at the start, backward_id in the one rooted
+    # at the goal; they are the same cell or neighbours.
+    ids = path_to_root(parent_forward, forward_id)
+    ids.reverse()
+    backward = path_to_root(parent_backward, backward_id)
+    ids.extend(backward[1:] if backward_id == forward_id else backward)
+    return [tuple(cell) for cell in coords[ids].tolist()]
+
+def follow_successors(successor, start_id, goal_id, coords):
+    # Walks a next-hop array (a greedy policy or a distance field) from start_id until the
+    # goal, a self-loop or a dead end (-1); a simple path never needs more than len(successor) steps.
+    ids = [start_id]
+    s = start_id
+    for _ in range(len(successor)):
+        if s == goal_id:
+            break
+        ns = int(successor[s])
+        if ns < 0 or ns == s:
+            break
+        s = ns
+        ids.append(s)
+    return [tuple(cell) for cell in coords[ids].tolist()]
+
 def overlay_path_on_maze(maze, path, algorithm_name, steps, runtime, filename):
     plt.figure(figsize=(8, 8))
-    plt.imshow(maze, cmap='binary')
+    plt.imshow(np.asarray(maze), cmap='binary')
     if path:
         rows = [p[0] for p in path]
         cols = [p[1] for p in path]
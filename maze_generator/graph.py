@@ -0,0 +1,111 @@
+import hashlib
+import numpy as np
+
+# Same action order as get_neighbors: up, down, left, right.
+actions = np.array([[-1, 0],
+                    [ 1, 0],
+                    [ 0, -1],
+                    [ 0,  1]])
+
+# Adjacency of the passable cells of a maze, built once per maze and shared by the solvers.
+# Passable cells are numbered 0..num_nodes-1 in row-major order. `adjacency` holds the
+# neighbour id in each action direction (-1 when blocked), `indptr`/`indices` the same
+# neighbours in CSR form.
+class MazeGraph:
+    def __init__(self, maze):
+        self.maze = maze
+        self.shape = maze.shape
+        rows, cols = self.shape
+        # Scanned in row blocks, so a memory-mapped maze is never compared as a whole.
+        block = max(1, (1 << 22) // max(cols, 1))
+        flat = np.concatenate([np.flatnonzero(maze[r:r + block] == 0) + r * cols
+                               for r in range(0, rows, block)] or [np.zeros(0, dtype=np.intp)])
+        self.num_nodes = len(flat)
+        self.coords = np.empty((self.num_nodes, 2), dtype=np.int32)
+        self.coords[:, 0], self.coords[:, 1] = np.divmod(flat, cols)
+        self.cell_ids = np.full(self.shape, -1, dtype=np.int32)
+        flat_ids = self.cell_ids.reshape(-1)
+        flat_ids[flat] = np.arange(self.num_nodes, dtype=np.int32)
+
+        # Filled one action column at a time, so no padded copy of the grid is needed.
+        r, c = self.coords[:, 0], self.coords[:, 1]
+        self.adjacency = np.full((self.num_nodes, len(actions)), -1, dtype=np.int32)
+        for a, (dr, dc) in enumerate(actions):
+            inside = (r + dr >= 0) & (r + dr < rows) & (c + dc >= 0) & (c + dc < cols)
+            self.adjacency[inside, a] = flat_ids[flat[inside] + (dr * cols + dc)]
+        del flat
+
+        valid = self.adjacency >= 0
+        self.indptr = np.zeros(self.num_nodes + 1, dtype=np.int32)
+        np.cumsum(valid.sum(axis=1), out=self.indptr[1:])
+        self.indices = self.adjacency[valid]
+        self._csr_lists = None
+        self._fingerprint = None
+
+    @classmethod
+    def from_arrays(cls, maze, coords, cell_ids, adjacency, indptr, indices):
+        # Wraps arrays an earlier MazeGraph built (e.g. memory-mapped from a SharedMazeStore)
+        # without recomputing or copying them.
+        graph = cls.__new__(cls)
+        graph.maze = maze
+        graph.shape = maze.shape
+        graph.num_nodes = len(coords)
+        graph.coords, graph.cell_ids, graph.adjacency = coords, cell_ids, adjacency
+        graph.indptr, graph.indices = indptr, indices
+        graph._csr_lists = None
+        graph._fingerprint = None
+        return graph
+
+    def node(self, cell):
+        r, c = cell
+        if not (0 <= r < self.shape[0] and 0 <= c < self.shape[1]):
+            return -1
+        return int(self.cell_ids[r, c])
+
+    def cell(self, node):
+        r, c = self.coords[node]
+        return (int(r), int(c))
+
+    def neighbors(self, node):
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def next_states(self, action_major=False):
+        # Deterministic transition table: moving into a wall leaves the agent in place.
+        # action_major=True gives the (num_actions, num_nodes) layout the MDP solvers sweep over.
+        ids = np.arange(self.num_nodes, dtype=np.int32)
+        if not action_major:
+            return np.where(self.adjacency >= 0, self.adjacency, ids[:, None])
+        table = np.empty((self.adjacency.shape[1], self.num_nodes), dtype=np.int32)
+        for a in range(len(table)):
+            column = self.adjacency[:, a]
+            np.copyto(table[a], np.where(column >= 0, column, ids))
+        return table
+
+    def to_grid(self, values, fill=0):
+        grid = np.full(self.shape, fill, dtype=np.asarray(values).dtype)
+        grid[self.coords[:, 0], self.coords[:, 1]] = values
+        return grid
+
+    def csr_lists(self):
+        # Plain Python lists are much faster than NumPy scalars inside the search loops.
+        if self._csr_lists is None:
+            self._csr_lists = (self.indptr.tolist(), self.indices.tolist())
+        return self._csr_lists
+
+    def fingerprint(self):
+        # Content hash of the wall layout, for keying caches of per-maze results.
+        if self._fingerprint is None:
+            self._fingerprint = maze_fingerprint(self.cell_ids >= 0)
+        return self._fingerprint
+
+def maze_fingerprint(open_cells):
+    # Content hash of a boolean grid of the open cells (shape included).
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(open_cells.shape, dtype=np.int64).tobytes())
+    digest.update(np.packbits(open_cells).tobytes())
+    return digest.hexdigest()
+
+def as_graph(maze):
+    if isinstance(maze, MazeGraph):
+        return maze
+    return MazeGraph(maze)
@@ -0,0 +1,49 @@
+import numpy as np
+
+# Compact wall storage for a maze: one byte per cell (uint8) or one bit per cell
+# (np.packbits along each row) instead of the 8-byte ints the generators allocate.
+# A Maze indexes like the 0/1 grid it wraps: maze[r, c] is the wall flag of one cell and
+# row slices (maze[r0:r1]) come back as uint8 arrays, so get_neighbors, MazeGraph and
+# the solvers accept it unchanged. np.asarray(maze) gives the full uint8 grid, a
+# zero-copy view when the storage is uint8.
+class Maze:
+    def __init__(self, walls, packed=False):
+        walls = np.asarray(walls)
+        if walls.dtype == np.uint8:
+            cells = walls
+        else:
+            cells = (walls != 0).view(np.uint8)
+        self.shape = cells.shape
+        self.packed = packed
+        if packed:
+            self.bits = np.packbits(cells != 0, axis=1)
+            self.cells = None
+        else:
+            self.cells = cells
+            self.bits = None
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes if self.packed else self.cells.nbytes
+
+    def __getitem__(self, key):
+        if not self.packed:
+            return self.cells[key]
+        rows, cols = key if isinstance(key, tuple) else (key, slice(None))
+        if isinstance(rows, (int, np.integer)) and isinstance(cols, (int, np.integer)):
+            if cols < 0:
+                cols += self.shape[1]
+            return (self.bits[rows, cols >> 3] >> (7 - (cols & 7))) & 1
+        return np.unpackbits(self.bits[rows], axis=-1, count=self.shape[1])[..., cols]
+
+    def __array__(self, dtype=None, copy=None):
+        grid = self.cells if not self.packed else np.unpackbits(self.bits, axis=1, count=self.shape[1])
+        return grid if dtype is None else grid.astype(dtype, copy=False)
+
+    def is_wall(self, r, c):
+        return bool(self[r, c])
+
+def as_maze(maze, packed=False):
+    if isinstance(maze, Maze):
+        return maze
+    return Maze(maze, packed=packed)
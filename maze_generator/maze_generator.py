@@ -2,6 +2,11 @@ import numpy as np
 import random
 import matplotlib.pyplot as plt
 
+def random_source(seed):
+    # Without a seed the generators keep drawing from the global `random` module, so
+    # seeding it still works; with one they use a private generator and leave it untouched.
+    return random if seed is None else random.Random(seed)
+
 def enforce_borders(maze):
     maze[0, :] = 1
     maze[-1, :] = 1
@@ -9,7 +14,8 @@ def enforce_borders(maze):
     maze[:, -1] = 1
     return maze
 
-def create_maze_dfs(dim):
+def create_maze_dfs(dim, seed=None):
+    rnd = random_source(seed)
     maze = np.ones((dim * 2 + 1, dim * 2 + 1), dtype=int)
     x, y = 0, 0
     maze[2 * x + 1, 2 * y + 1] = 0
@@ -18,7 +24,7 @@ def create_maze_dfs(dim):
     while stack:
         x, y = stack[-1]
         directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        random.shuffle(directions)
+        rnd.shuffle(directions)
         found = False
         for dx, dy in directions:
             nx, ny = x + dx, y + dy
@@ -41,10 +47,11 @@ def create_maze_dfs(dim):
     
     return maze
 
-def create_maze_prims(dim, extra_openings=0):
+def create_maze_prims(dim, extra_openings=0, seed=None):
+    rnd = random_source(seed)
     maze = np.ones((2 * dim + 1, 2 * dim + 1), dtype=int)
-    start_x = random.randint(0, dim - 1)
-    start_y = random.randint(0, dim - 1)
+    start_x = rnd.randint(0, dim - 1)
+    start_y = rnd.randint(0, dim - 1)
     maze[2 * start_x + 1, 2 * start_y + 1] = 0
     walls = []
     for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
@@ -57,7 +64,7 @@ def create_maze_prims(dim, extra_openings=0):
     visited = {(start_x, start_y)}
     
     while walls:
-        idx = random.randint(0, len(walls) - 1)
+        idx = rnd.randint(0, len(walls) - 1)
         cell_x, cell_y, nx, ny, wx, wy = walls.pop(idx)
         if (nx, ny) not in visited:
             maze[wy, wx] = 0
@@ -73,8 +80,8 @@ def create_maze_prims(dim, extra_openings=0):
                     
 
     for _ in range(extra_openings):
-        i = random.randint(1, 2 * dim - 1)
-        j = random.randint(1, 2 * dim - 1)
+        i = rnd.randint(1, 2 * dim - 1)
+        j = rnd.randint(1, 2 * dim - 1)
         maze[i, j] = 0
         
     maze[1, 0] = 0
@@ -86,11 +93,12 @@ def create_maze_prims(dim, extra_openings=0):
     
     return maze
 
-def create_maze_aldous_broder(n, m, complexity=0):
+def create_maze_aldous_broder(n, m, complexity=0, seed=None):
+    rnd = random_source(seed)
     maze = np.ones((2 * n + 1, 2 * m + 1), dtype=int)
     visited = np.zeros((n, m), dtype=bool)
-    start_x = random.randint(0, n - 1)
-    start_y = random.randint(0, m - 1)
+    start_x = rnd.randint(0, n - 1)
+    start_y = rnd.randint(0, m - 1)
     visited[start_x, start_y] = True
     cells_visited = 1
     total_cells = n * m
@@ -108,7 +116,7 @@ def create_maze_aldous_broder(n, m, complexity=0):
             neighbors.append((x, y - 1, 'W'))
         if y < m - 1:
             neighbors.append((x, y + 1, 'E'))
-        nx, ny, direction = random.choice(neighbors)
+        nx, ny, direction = rnd.choice(neighbors)
         if not visited[nx, ny]:
             if direction == 'N':
                 maze[2 * x, 2 * y + 1] = 0
@@ -129,8 +137,8 @@ def create_maze_aldous_broder(n, m, complexity=0):
     
 
     for _ in range(complexity):
-        i = random.randint(1, 2 * n - 1)
-        j = random.randint(1, 2 * m - 1)
+        i = rnd.randint(1, 2 * n - 1)
+        j = rnd.randint(1, 2 * m - 1)
         maze[i, j] = 0
 
     maze = enforce_borders(maze)
@@ -139,18 +147,213 @@ def create_maze_aldous_broder(n, m, complexity=0):
     
     return maze
 
-def generate_maze(difficulty=5, dim=20):
+# The generators below scale to very large dimensions. They keep the same cell layout
+# (cell (x, y) at maze[2x+1, 2y+1], walls in between) but return uint8 mazes. The
+# vectorized ones draw from a NumPy generator seeded from the Python one, so one seed
+# still fixes the maze.
+
+def numpy_rng(rnd):
+    return np.random.default_rng(rnd.getrandbits(64))
+
+def _add_openings(maze, count, rnd):
+    rows, cols = maze.shape
+    for _ in range(count):
+        maze[rnd.randint(1, rows - 2), rnd.randint(1, cols - 2)] = 0
+
+def _open_entrance_and_exit(maze):
+    maze = enforce_borders(maze)
+    maze[1, 0] = 0
+    maze[-2, -1] = 0
+    return maze
+
+def _carve_cell_tree(n, m, carved_cells, carved_walls):
+    # Writes the carved cells and walls (flat maze indices) in two vectorized stores.
+    maze = np.ones((2 * n + 1, 2 * m + 1), dtype=np.uint8)
+    flat = maze.reshape(-1)
+    flat[np.array(carved_cells, dtype=np.int64)] = 0
+    flat[np.array(carved_walls, dtype=np.int64)] = 0
+    return maze
+
+def create_maze_prims_fast(dim, extra_openings=0, seed=None):
+    # Randomized Prim's with an O(1) frontier: the chosen wall is swapped with the last
+    # one and popped instead of list.pop(idx). Frontier walls are ints cell * 4 + direction.
+    rnd = random_source(seed)
+    width = 2 * dim + 1
+    total_cells = dim * dim
+    cell_step = (-dim, dim, -1, 1)
+    maze_step = (-width, width, -1, 1)
+    visited = bytearray(total_cells)
+    rand = rnd.random
+
+    def maze_index(cell):
+        return (2 * (cell // dim) + 1) * width + 2 * (cell % dim) + 1
+
+    def add_walls(cell):
+        col = cell % dim
+        if cell >= dim and not visited[cell - dim]:
+            walls.append(cell * 4)
+        if cell < total_cells - dim and not visited[cell + dim]:
+            walls.append(cell * 4 + 1)
+        if col > 0 and not visited[cell - 1]:
+            walls.append(cell * 4 + 2)
+        if col < dim - 1 and not visited[cell + 1]:
+            walls.append(cell * 4 + 3)
+
+    start = rnd.randrange(total_cells)
+    visited[start] = 1
+    carved_cells, carved_walls = [maze_index(start)], []
+    walls = []
+    add_walls(start)
+    while walls:
+        idx = int(rand() * len(walls))
+        wall = walls[idx]
+        walls[idx] = walls[-1]
+        walls.pop()
+        cell, direction = wall >> 2, wall & 3
+        neighbor = cell + cell_step[direction]
+        if not visited[neighbor]:
+            visited[neighbor] = 1
+            carved_walls.append(maze_index(cell) + maze_step[direction])
+            carved_cells.append(maze_index(neighbor))
+            add_walls(neighbor)
+
+    maze = _carve_cell_tree(dim, dim, carved_cells, carved_walls)
+    del carved_cells, carved_walls
+    _add_openings(maze, extra_openings, rnd)
+    return _open_entrance_and_exit(maze)
+
+def create_maze_wilson(n, m, complexity=0, seed=None):
+    # Wilson's algorithm: a uniform spanning tree like Aldous-Broder, but each random walk
+    # only runs until it hits the tree and is then loop-erased, so no time is spent
+    # wandering through cells that are already carved.
+    rnd = random_source(seed)
+    width = 2 * m + 1
+    total_cells = n * m
+    cell_step = (-m, m, -1, 1)
+    maze_step = (-width, width, -1, 1)
+    in_tree = bytearray(total_cells)
+    heading = bytearray(total_cells)
+    rng = numpy_rng(rnd)
+    rolls, roll_idx = b"", 0
+
+    def maze_index(cell):
+        return (2 * (cell // m) + 1) * width + 2 * (cell % m) + 1
+
+    root = rnd.randrange(total_cells)
+    in_tree[root] = 1
+    carved_cells, carved_walls = [maze_index(root)], []
+    for walk_start in range(total_cells):
+        if in_tree[walk_start]:
+            continue
+        # Random walk until the tree is hit. Overwriting the heading of a revisited cell
+        # erases the loop.
+        cell = walk_start
+        while not in_tree[cell]:
+            if roll_idx == len(rolls):
+                rolls, roll_idx = rng.integers(0, 4, size=1 << 20, dtype=np.uint8).tobytes(), 0
+            direction = rolls[roll_idx]
+            roll_idx += 1
+            # Moves off the grid are rejected, which keeps the choice uniform among the valid ones.
+            if direction == 0:
+                if cell < m:
+                    continue
+            elif direction == 1:
+                if cell >= total_cells - m:
+                    continue
+            elif direction == 2:
+                if cell % m == 0:
+                    continue
+            elif cell % m == m - 1:
+                continue
+            heading[cell] = direction
+            cell += cell_step[direction]
+        # Retrace the loop-erased walk into the tree.
+        cell = walk_start
+        while not in_tree[cell]:
+            in_tree[cell] = 1
+            index = maze_index(cell)
+            direction = heading[cell]
+            carved_cells.append(index)
+            carved_walls.append(index + maze_step[direction])
+            cell += cell_step[direction]
+
+    maze = _carve_cell_tree(n, m, carved_cells, carved_walls)
+    del carved_cells, carved_walls
+    _add_openings(maze, complexity, rnd)
+    return _open_entrance_and_exit(maze)
+
+def create_maze_binary_tree(dim, seed=None):
+    # Every cell opens its north or west wall at random; the top row can only open west
+    # and the left column only north. Fully vectorized.
+    rnd = random_source(seed)
+    rng = numpy_rng(rnd)
+    maze = np.ones((2 * dim + 1, 2 * dim + 1), dtype=np.uint8)
+    maze[1::2, 1::2] = 0
+    north = rng.random((dim, dim)) < 0.5
+    north[:, 0] = True
+    north[0, :] = False
+    west = ~north
+    west[:, 0] = False
+    maze[0:2 * dim:2, 1::2][north] = 0
+    maze[1::2, 0:2 * dim:2][west] = 0
+    return _open_entrance_and_exit(maze)
+
+def create_maze_sidewinder(dim, seed=None):
+    # Sidewinder, one vectorized pass over all rows: each row is cut into runs of cells
+    # joined eastwards, and every run below the top row opens north from one random cell.
+    # The top row is a single corridor.
+    rnd = random_source(seed)
+    rng = numpy_rng(rnd)
+    maze = np.ones((2 * dim + 1, 2 * dim + 1), dtype=np.uint8)
+    maze[1::2, 1::2] = 0
+    east = rng.random((dim, dim)) < 0.5
+    east[0, :] = True
+    east[:, -1] = False
+    maze[1::2, 2:2 * dim:2][east[:, :-1]] = 0
+
+    # Runs in rows 1.. in row-major order; every row ends a run, so runs never wrap.
+    ends = np.flatnonzero(~east[1:].reshape(-1))
+    starts = np.concatenate(([0], ends[:-1] + 1))[:len(ends)]
+    chosen = starts + (rng.random(len(ends)) * (ends - starts + 1)).astype(np.int64)
+    x, y = np.divmod(chosen, dim)
+    maze[2 * (x + 1), 2 * y + 1] = 0
+    return _open_entrance_and_exit(maze)
+
+def maze_algorithm(difficulty, fast=False):
+    # Name of the generator generate_maze picks for a difficulty, e.g. for cache keys.
+    if difficulty <= 3:
+        return "sidewinder" if fast else "dfs"
+    elif difficulty <= 6:
+        return "prims_fast" if fast else "prims"
+    return "wilson" if fast else "aldous_broder"
+
+def generate_maze(difficulty=5, dim=20, fast=False, seed=None):
+    # fast=True keeps the difficulty bands but uses the scalable generators: Sidewinder
+    # for perfect mazes, the swap-remove Prim's, and Wilson's instead of Aldous-Broder.
+    # The same seed always gives the same maze.
+    if fast:
+        if difficulty <= 3:
+            print("Using Sidewinder algorithm (perfect maze)")
+            return create_maze_sidewinder(dim, seed=seed)
+        elif difficulty <= 6:
+            extra = (difficulty - 3) * 2
+            print("Using Prim's algorithm (swap-remove frontier) with extra openings =", extra)
+            return create_maze_prims_fast(dim, extra_openings=extra, seed=seed)
+        else:
+            complexity = (difficulty - 6) * 10
+            print("Using Wilson's algorithm with complexity =", complexity)
+            return create_maze_wilson(dim, dim, complexity=complexity, seed=seed)
     if difficulty <= 3:
         print("Using DFS algorithm (perfect maze)")
-        return create_maze_dfs(dim)
+        return create_maze_dfs(dim, seed=seed)
     elif difficulty <= 6:
         extra = (difficulty - 3) * 2
         print("Using Prim's algorithm with extra openings =", extra)
-        return create_maze_prims(dim, extra_openings=extra)
+        return create_maze_prims(dim, extra_openings=extra, seed=seed)
     else:
         complexity = (difficulty - 6) * 10
         print("Using Aldous-Broder algorithm with complexity =", complexity)
-        return create_maze_aldous_broder(dim, dim, complexity=complexity)
+        return create_maze_aldous_broder(dim, dim, complexity=complexity, seed=seed)
 
 def plot_maze(maze, title=None):
     plt.figure(figsize=(8, 8))
@@ -0,0 +1,56 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+# Solution images rendered straight from the maze array: walls and passages become a
+# uint8 RGB image, the path is painted in with one fancy-indexing store, and the result
+# is written with Pillow at a low zlib level. No pyplot figure is created, so rendering
+# is headless and cheap enough to run many images concurrently. Encoding releases the
+# GIL, so a thread pool (RenderPool) keeps it off the solver's critical path.
+
+wall_color = (0, 0, 0)
+passage_color = (255, 255, 255)
+path_color = (220, 30, 30)
+
+def solution_image(maze, path=None, min_size=512):
+    # Small mazes are scaled up by whole pixels so that each cell stays a crisp block.
+    walls = np.asarray(maze) != 0
+    rgb = np.empty(walls.shape + (3,), dtype=np.uint8)
+    rgb[walls] = wall_color
+    rgb[~walls] = passage_color
+    if path:
+        cells = np.asarray(path)
+        rgb[cells[:, 0], cells[:, 1]] = path_color
+    scale = max(1, min_size // max(walls.shape))
+    if scale > 1:
+        rgb = rgb.repeat(scale, axis=0).repeat(scale, axis=1)
+    return rgb
+
+def write_png(filename, rgb, compress_level=1):
+    Image.fromarray(rgb).save(filename, compress_level=compress_level)
+
+def render_solution(maze, path, filename):
+    write_png(filename, solution_image(maze, path))
+
+class RenderPool:
+    # Renders solution images in background threads; wait() blocks until all are written.
+    def __init__(self, max_workers=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.futures = []
+
+    def submit(self, maze, path, filename):
+        self.futures.append(self.executor.submit(render_solution, maze, path, filename))
+
+    def wait(self):
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self.wait()
+        finally:
+            self.executor.shutdown()
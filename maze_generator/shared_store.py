@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import numpy as np
+from maze_generator.graph import MazeGraph
+
+# Mazes shared by many worker processes without a copy per worker. The parent (or any
+# worker) publishes a maze once as plain .npy files, together with the arrays of its
+# MazeGraph, and every process that attaches memory-maps them read-only: all of them read
+# the same page-cache pages, so the maze and its adjacency live in memory once however
+# many workers solve on them. The store directory defaults to /dev/shm where it exists,
+# so the files never touch a disk. A handle is just the path prefix of one maze's files,
+# a small string that is cheap to pass to a pool task instead of the array.
+#
+#   with SharedMazeStore() as store:
+#       handle = store.publish("dim=4000-seed=0", maze)
+#       pool.submit(run, handle)          # in the worker: graph = attach_graph(handle)
+
+graph_fields = ("coords", "cell_ids", "adjacency", "indptr", "indices")
+
+def _save(path, array):
+    # Written under a temporary name and renamed, so no process attaches a partial file.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(array))
+    os.replace(tmp_path, path)
+
+def publish_maze(directory, name, maze, graph=True):
+    # Returns the handle. graph=True also stores the MazeGraph arrays (built here unless
+    # a MazeGraph is passed), so attaching workers do not rebuild them.
+    prefix = Path(directory) / name
+    if isinstance(maze, MazeGraph):
+        maze_graph, maze = maze, maze.maze
+    else:
+        maze_graph = MazeGraph(maze) if graph else None
+    if maze_graph is not None:
+        for field in graph_fields:
+            _save(Path(f"{prefix}.{field}.npy"), getattr(maze_graph, field))
+    _save(Path(f"{prefix}.maze.npy"), np.asarray(maze, dtype=np.uint8))
+    return str(prefix)
+
+def attach_maze(handle):
+    return np.load(f"{handle}.maze.npy", mmap_mode="r")
+
+def attach_graph(handle):
+    # The published MazeGraph over read-only memory maps, or a new one if only the maze was published.
+    maze = attach_maze(handle)
+    if not os.path.exists(f"{handle}.{graph_fields[0]}.npy"):
+        return MazeGraph(maze)
+    arrays = {field: np.load(f"{handle}.{field}.npy", mmap_mode="r") for field in graph_fields}
+    return MazeGraph.from_arrays(maze, **arrays)
+
+class SharedMazeStore:
+    # Owns a fresh store directory and removes it, with every published maze, on close().
+    def __init__(self, directory=None):
+        if directory is None and os.path.isdir("/dev/shm"):
+            directory = "/dev/shm"
+        self.directory = Path(tempfile.mkdtemp(prefix="maze_store_", dir=directory))
+
+    def publish(self, name, maze, graph=True):
+        return publish_maze(self.directory, name, maze, graph)
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,92 @@
+import argparse
+import time
+import numpy as np
+from maze_generator.maze_generator import numpy_rng, random_source
+
+# Eller's algorithm keeps only the set labels of one row of cells, so a maze can be
+# generated row by row straight into a memory-mapped uint8 .npy file. Memory stays
+# O(width) no matter how many rows are written. The file opens again with open_maze
+# (np.load with mmap_mode) and the result can be passed to any solver like an in-memory maze.
+
+def eller_rows(n, m, seed=None):
+    # Yields the 2n+1 maze rows of an n x m cell perfect maze, top to bottom, as uint8
+    # arrays of width 2m+1. Entrance and exit are opened as in the other generators.
+    width = 2 * m + 1
+    rnd = random_source(seed)
+    rng = numpy_rng(rnd)
+    rand = rnd.random
+    labels = np.full(m, -1, dtype=np.int64)
+
+    yield np.ones(width, dtype=np.uint8)
+    for x in range(n):
+        last = x == n - 1
+        # Cells not reached from above start their own set. Carried labels are compacted
+        # to 0..m-1 below, so m + column is always unused.
+        fresh = labels < 0
+        labels[fresh] = m + np.flatnonzero(fresh)
+        union = list(range(2 * m))
+
+        def find(label):
+            while union[label] != label:
+                union[label] = union[union[label]]
+                label = union[label]
+            return label
+
+        # Join neighbours in different sets at random (always on the last row).
+        cells = np.ones(width, dtype=np.uint8)
+        cells[1::2] = 0
+        row_labels = labels.tolist()
+        joined = []
+        for y in range(m - 1):
+            a, b = find(row_labels[y]), find(row_labels[y + 1])
+            if a != b and (last or rand() < 0.5):
+                union[b] = a
+                joined.append(2 * y + 2)
+        cells[joined] = 0
+        if x == 0:
+            cells[0] = 0
+        if last:
+            cells[-1] = 0
+        yield cells
+
+        if last:
+            break
+        roots = np.array([find(label) for label in row_labels], dtype=np.int64)
+        # Every set carries on downwards through at least one cell, others at random.
+        down = rng.random(m) < 0.5
+        order = np.lexsort((rng.random(m), roots))
+        group_start = np.ones(m, dtype=bool)
+        group_start[1:] = roots[order][1:] != roots[order][:-1]
+        down[order[group_start]] = True
+        south = np.ones(width, dtype=np.uint8)
+        south[1::2][down] = 0
+        yield south
+        _, compact = np.unique(roots, return_inverse=True)
+        labels = np.where(down, compact, -1)
+    yield np.ones(width, dtype=np.uint8)
+
+def write_maze_eller(path, n, m=None, seed=None):
+    # Streams an Eller's maze into a uint8 .npy at `path` and returns it memory-mapped.
+    m = n if m is None else m
+    maze = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(2 * n + 1, 2 * m + 1))
+    for r, row in enumerate(eller_rows(n, m, seed=seed)):
+        maze[r] = row
+    maze.flush()
+    del maze
+    return open_maze(path)
+
+def open_maze(path):
+    return np.load(path, mmap_mode="r")
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream an Eller's algorithm maze to a .npy file.")
+    parser.add_argument("path")
+    parser.add_argument("--dim", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    begin = time.perf_counter()
+    maze = write_maze_eller(args.path, args.dim, seed=args.seed)
+    print(f"Wrote {maze.shape[0]}x{maze.shape[1]} maze to {args.path} in {time.perf_counter() - begin:.2f} sec")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+import argparse
+import asyncio
+import contextlib
+import functools
+import io
+import json
+import os
+import signal
+import time
+import uuid
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from alogrithms.batch_solver import solve_batch
+from alogrithms.mdp_cache import MDPCache
+from alogrithms.solvers import mdp_algorithms, solve_functions
+from maze_generator.cache import load_maze
+from maze_generator.shared_store import SharedMazeStore, attach_graph, attach_maze, publish_maze
+
+# Local asyncio solve service. Mazes are held in memory by id, and solve requests for any
+# algorithm in solve_functions run on a process pool, so the event loop only parses and
+# answers requests. Each maze is published with its graph to a SharedMazeStore once, and
+# the pool workers memory-map it, so a task carries only the store handle, never the array.
+# Plain HTTP/1.1 with JSON bodies, on TCP or a Unix socket:
+#
+#   POST /mazes   {"difficulty": 6, "dim": 100, "seed": 0, "fast": false}  or  {"maze": [[0, 1, ...], ...]}
+#                 -> {"maze_id": "...", "shape": [rows, cols]}
+#   POST /solve   {"maze_id": "...", "algorithm": "BFS", "start": [1, 0], "goal": [r, c], "params": {}}
+#                 (params: the algorithm's tunables in solver_params, e.g. {"discount": 0.9} for MDP_VALUE)
+#                 -> {"path": [[r, c], ...], "steps": n, "runtime": sec, "coalesced": false}
+#   GET  /mazes   -> ids and shapes of the stored mazes
+#   GET  /stats   -> request counters and latency percentiles (ms), overall and per algorithm
+#
+# Concurrent requests for the same (maze, algorithm, goal, params) are coalesced: the
+# first one opens a batch, requests arriving within --batch-window join it, and the whole
+# batch is one task on the pool. Requests for the same start share one solve. Only
+# algorithms that can share work across starts batch them: BFS answers every start of a
+# batch from one reverse BFS field from the goal, and the MDP solvers from the worker's
+# MDPCache, so one value or policy iteration serves the whole batch. Every other solver
+# also keys its batches on the start, so distinct starts are separate pool tasks and each
+# reply (and its latency sample) comes from the solver that was asked for. A request
+# matching a batch that is already running waits for its result instead of queueing
+# another solve.
+#
+#   python solve_service.py --port 8765 --workers 4
+#   python -m benchmarks.service_load --port 8765 --requests 2000 --concurrency 32
+
+# The tunables a client may pass in "params", per algorithm; other solver keywords
+# (stats, workers, dtype, ...) stay under the service's control.
+solver_params = {
+    "MDP_VALUE": ("discount", "theta", "mode"),
+    "MDP_POLICY": ("discount", "theta", "evaluation", "sweeps"),
+    "HPA*": ("cluster_size",),
+}
+
+# Solvers whose batches are answered from one distance field: only BFS, so a reply never
+# carries another algorithm's name on a BFS path or timing.
+field_algorithms = ("BFS",)
+batched_algorithms = field_algorithms + mdp_algorithms
+
+# Worker side: attached graphs of recently used mazes, and the converged MDP solutions,
+# per process.
+_worker_graphs = OrderedDict()
+_worker_graph_limit = 4
+_worker_mdp_cache = None
+
+def _worker_graph(handle):
+    graph = _worker_graphs.get(handle)
+    if graph is None:
+        graph = _worker_graphs[handle] = attach_graph(handle)
+        while len(_worker_graphs) > _worker_graph_limit:
+            _worker_graphs.popitem(last=False)
+    _worker_graphs.move_to_end(handle)
+    return graph
+
+def _solve_batch(handle, algorithm, goal, starts, params):
+    # Runs in a pool process. Returns one result dict per start, in order.
+    global _worker_mdp_cache
+    graph = _worker_graph(handle)
+    solve_func = solve_functions[algorithm]
+    params = dict(params)
+    if algorithm in mdp_algorithms:
+        if _worker_mdp_cache is None:
+            _worker_mdp_cache = MDPCache()
+        params["cache"] = _worker_mdp_cache
+    if algorithm in field_algorithms and len(starts) > 1:
+        return _solve_from_field(graph, goal, starts)
+    results = []
+    for start in starts:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                path, steps, runtime = solve_func(graph, start, goal, **params)
+            results.append({"path": [list(cell) for cell in path] if path else None, "steps": steps,
+                            "runtime": runtime})
+        except Exception as e:
+            results.append({"error": f"{type(e).__name__}: {e}"})
+    return results
+
+def _solve_from_field(graph, goal, starts):
+    # One reverse BFS from the goal answers every start; each runtime counts that shared
+    # setup plus the start's own walk. A walled-in or outside goal has no path, as with
+    # the solvers themselves.
+    if graph.node(goal) < 0:
+        return [{"path": None, "steps": 0, "runtime": 0.0}] * len(starts)
+    stats = {}
+    answers = list(solve_batch(graph, starts, goal, stats=stats))
+    return [{"path": [list(cell) for cell in path] if path else None, "steps": steps,
+             "runtime": stats["setup_time"] + runtime} for path, steps, runtime in answers]
+
+def _publish_maze(store_dir, maze_id, maze=None, difficulty=5, dim=20, seed=None, fast=False):
+    # Runs in a pool process: generates the maze unless one is given, and publishes it with its graph.
+    if maze is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            maze = load_maze(difficulty=difficulty, dim=dim, seed=seed, fast=fast)
+    return publish_maze(store_dir, maze_id, maze)
+
+def latency_summary(samples):
+    if not samples:
+        return {"count": 0}
+    p50, p90, p99 = np.percentile(np.asarray(samples) * 1e3, [50, 90, 99])
+    return {"count": len(samples), "p50": float(p50), "p90": float(p90), "p99": float(p99),
+            "max": max(samples) * 1e3}
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class SolveService:
+    def __init__(self, workers=None, batch_window=0.002, latency_samples=10000):
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.store = SharedMazeStore()
+        self.batch_window = batch_window
+        # Read-only views of the published mazes, and their store handles, by maze id.
+        self.mazes = {}
+        self.handles = {}
+        # Batches still collecting requests, by key; each maps start -> future.
+        self.open_batches = {}
+        # Futures of dispatched batches, by (key, start), until their results are in.
+        self.running = {}
+        self.dispatch_tasks = set()
+        self.latencies = defaultdict(lambda: deque(maxlen=latency_samples))
+        self.counters = {"requests": 0, "batches": 0, "solves": 0, "coalesced": 0, "errors": 0}
+
+    async def add_maze(self, body):
+        maze_id = uuid.uuid4().hex[:12]
+        if "maze" in body:
+            maze = np.asarray(body["maze"], dtype=np.uint8)
+            if maze.ndim != 2:
+                raise RequestError(400, "maze must be a 2D list of 0/1 cells")
+            job = functools.partial(_publish_maze, self.store.directory, maze_id, maze)
+        else:
+            job = functools.partial(_publish_maze, self.store.directory, maze_id, difficulty=int(body.get("difficulty", 5)),
+                                    dim=int(body.get("dim", 20)), seed=body.get("seed"),
+                                    fast=bool(body.get("fast", False)))
+        handle = await asyncio.get_running_loop().run_in_executor(self.pool, job)
+        self.handles[maze_id] = handle
+        self.mazes[maze_id] = attach_maze(handle)
+        return {"maze_id": maze_id, "shape": list(self.mazes[maze_id].shape)}
+
+    async def solve(self, body):
+        maze_id, algorithm = body.get("maze_id"), body.get("algorithm")
+        if maze_id not in self.mazes:
+            raise RequestError(404, f"unknown maze_id: {maze_id}")
+        if algorithm not in solve_functions:
+            raise RequestError(400, f"unknown algorithm: {algorithm}; options: {', '.join(solve_functions)}")
+        maze = self.mazes[maze_id]
+        start = tuple(int(v) for v in body.get("start", (1, 0)))
+        goal = tuple(int(v) for v in body.get("goal", (maze.shape[0] - 2, maze.shape[1] - 1)))
+        params = body.get("params") or {}
+        if not isinstance(params, dict):
+            raise RequestError(400, "params must be a JSON object")
+        allowed = solver_params.get(algorithm, ())
+        unknown = sorted(set(params) - set(allowed))
+        if unknown:
+            raise RequestError(400, f"unsupported params for {algorithm}: {', '.join(unknown)}; "
+                                    f"allowed: {', '.join(allowed) or 'none'}")
+        batch_start = None if algorithm in batched_algorithms else start
+        key = (maze_id, algorithm, goal, json.dumps(params, sort_keys=True), batch_start)
+
+        # Coalesced: answered by a batch that another request opened or that is already running.
+        future = self.running.get((key, start))
+        coalesced = future is not None
+        if future is None:
+            batch = self.open_batches.get(key)
+            coalesced = batch is not None
+            if batch is None:
+                batch = self.open_batches[key] = {}
+                task = asyncio.get_running_loop().create_task(self._dispatch(key, batch, params))
+                self.dispatch_tasks.add(task)
+                task.add_done_callback(self.dispatch_tasks.discard)
+            future = batch.get(start)
+            if future is None:
+                future = batch[start] = asyncio.get_running_loop().create_future()
+        self.counters["coalesced"] += coalesced
+        # Shielded, so a client hanging up does not cancel the result for the others.
+        result = await asyncio.shield(future)
+        if "error" in result:
+            raise RequestError(400, result["error"])
+        return dict(result, coalesced=coalesced)
+
+    async def _dispatch(self, key, batch, params):
+        await asyncio.sleep(self.batch_window)
+        del self.open_batches[key]
+        maze_id, algorithm, goal = key[:3]
+        starts = list(batch)
+        for start in starts:
+            self.running[(key, start)] = batch[start]
+        self.counters["batches"] += 1
+        self.counters["solves"] += len(starts)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.pool, _solve_batch, self.handles[maze_id], algorithm, goal, starts, params)
+            for start, result in zip(starts, results):
+                batch[start].set_result(result)
+        except Exception as e:
+            for start in starts:
+                if not batch[start].done():
+                    batch[start].set_result({"error": f"{type(e).__name__}: {e}"})
+        finally:
+            for start in starts:
+                self.running.pop((key, start), None)
+
+    def stats(self):
+        latency = {"all": latency_summary([t for samples in self.latencies.values() for t in samples])}
+        latency.update({name: latency_summary(samples) for name, samples in sorted(self.latencies.items())})
+        return {**self.counters, "mazes": len(self.mazes), "latency_ms": latency}
+
+    async def route(self, method, path, body):
+        if method == "POST" and path == "/solve":
+            return await self.solve(body)
+        if method == "POST" and path == "/mazes":
+            return await self.add_maze(body)
+        if method == "GET" and path == "/mazes":
+            return {maze_id: list(maze.shape) for maze_id, maze in self.mazes.items()}
+        if method == "GET" and path == "/stats":
+            return self.stats()
+        raise RequestError(404, f"no route for {method} {path}")
+
+    async def handle_connection(self, reader, writer):
+        # One HTTP/1.1 request after another on a keep-alive connection.
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                data = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                begin = time.perf_counter()
+                self.counters["requests"] += 1
+                try:
+                    body = json.loads(data) if data else {}
+                    if not isinstance(body, dict):
+                        raise RequestError(400, "the request body must be a JSON object")
+                    status, payload = 200, await self.route(method, path, body)
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (ValueError, TypeError) as e:
+                    status, payload = 400, {"error": f"bad request: {e}"}
+                except Exception as e:
+                    # E.g. a broken process pool: still an answer, and counted as an error.
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                if status != 200:
+                    self.counters["errors"] += 1
+                elif path == "/solve":
+                    self.latencies[body["algorithm"]].append(time.perf_counter() - begin)
+
+                response = json.dumps(payload).encode()
+                reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}[status]
+                writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(response)}\r\n\r\n".encode() + response)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        self.store.close()
+
+class ServiceClient:
+    # Minimal keep-alive HTTP/1.1 JSON client for the service, over TCP or a Unix socket.
+    def __init__(self, host="127.0.0.1", port=8765, unix=None):
+        self.host, self.port, self.unix = host, port, unix
+        self.reader = self.writer = None
+
+    async def call(self, method, path, payload=None):
+        if self.writer is None:
+            if self.unix:
+                self.reader, self.writer = await asyncio.open_unix_connection(self.unix)
+            else:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        data = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.reader = self.writer = None
+
+async def serve(args):
+    service = SolveService(workers=args.workers, batch_window=args.batch_window / 1000)
+    if args.unix:
+        server = await asyncio.start_unix_server(service.handle_connection, path=args.unix)
+        where = args.unix
+    else:
+        server = await asyncio.start_server(service.handle_connection, args.host, args.port)
+        where = f"http://{args.host}:{args.port}"
+    print(f"Solve service listening on {where} with {args.workers or os.cpu_count()} workers", flush=True)
+    # SIGINT/SIGTERM stop the server and shut the pool down, so no worker process outlives it.
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        service.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Asynchronous maze solve service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Listen on this Unix socket path instead of TCP.")
+    parser.add_argument("--workers", type=int, help="Solver processes (default: one per CPU).")
+    parser.add_argument("--batch-window", type=float, default=2.0,
+                        help="Milliseconds a new batch waits for more requests for the same maze and goal.")
+    args = parser.parse_args()
+    asyncio.run(serve(args))
+
+if __name__ == "__main__":
+    main()